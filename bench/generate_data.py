@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine
+Generate a synthetic NSE-like data tree for benchmarks
+
+✔ data/master/{SYMBOL}.csv        DATE, OPEN, HIGH, LOW, CLOSE, TOTTRDQTY
+✔ data/master_future/{SYMBOL}.csv DATE, EXPIRY, OPEN, HIGH, LOW, CLOSE, TOTTRDQTY
+✔ Weekday calendar with random holidays, 0.05 price ticks
+✔ Monthly futures expiring on the last Thursday, 3 contracts open per day
+
+Usage:
+    python bench/generate_data.py --base /tmp/ee_bench --symbols 500 --days 750
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ================= PARAMETERS =================
+END_DATE = "2026-10-16"
+HOLIDAYS_PER_YEAR = 12
+TICK = 0.05
+
+# Share of symbols with a futures file (NSE F&O list ≈ 1 in 10)
+FUTURES_SHARE = 0.1
+OPEN_CONTRACTS = 3
+CARRY = 0.07
+
+# ================= CALENDAR =================
+def trading_days(days, rng):
+    # Enough weekdays to cover `days` after random holidays are removed
+    span = pd.bdate_range(end=END_DATE, periods=int(days * 1.1) + 30)
+    holidays = rng.random(len(span)) < HOLIDAYS_PER_YEAR / 250
+    return span[~holidays][-days:]
+
+
+def expiries(dates):
+    # Last Thursday of each month, moved back to the previous trading day
+    months = pd.period_range(
+        dates[0], dates[-1] + pd.DateOffset(months=OPEN_CONTRACTS), freq="M"
+    )
+    last_thu = [
+        m.end_time.normalize() - pd.Timedelta(days=(m.end_time.weekday() - 3) % 7)
+        for m in months
+    ]
+    days = dates.values
+    out = []
+    for e in last_thu:
+        i = np.searchsorted(days, np.datetime64(e), "right") - 1
+        out.append(dates[i] if i >= 0 and e <= dates[-1] else e)
+    return pd.DatetimeIndex(out)
+
+# ================= SERIES =================
+def ticks(x):
+    return np.round(np.round(x / TICK) * TICK, 2)
+
+
+def daily_bars(n, rng):
+    vol = rng.uniform(0.01, 0.03)
+    close = rng.uniform(50, 3000) * np.exp(np.cumsum(rng.normal(0, vol, n)))
+    prev = np.concatenate([[close[0]], close[:-1]])
+
+    open_ = prev * (1 + rng.normal(0, vol / 3, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2, n)))
+
+    # Persistent volume regime + daily noise
+    level = np.exp(np.convolve(rng.normal(0, 0.3, n), np.ones(10) / 10, "same"))
+    qty = (rng.lognormal(11, 1) * level * rng.lognormal(0, 0.4, n)).astype(np.int64)
+
+    return pd.DataFrame({
+        "OPEN": ticks(open_),
+        "HIGH": ticks(high),
+        "LOW": ticks(low),
+        "CLOSE": ticks(close),
+        "TOTTRDQTY": qty,
+    })
+
+
+def future_bars(dates, spot, expiry_dates, rng):
+    # The OPEN_CONTRACTS nearest expiries on or after each date
+    first = np.searchsorted(expiry_dates.values, dates.values)
+    frames = []
+    for k in range(OPEN_CONTRACTS):
+        exp = expiry_dates[first + k]
+        carry = 1 + CARRY * (exp - dates).days.to_numpy() / 365
+        noise = 1 + rng.normal(0, 0.001, len(dates))
+
+        bars = spot[["OPEN", "HIGH", "LOW", "CLOSE"]].mul(carry * noise, axis=0)
+        bars = bars.apply(ticks)
+        bars["TOTTRDQTY"] = (spot["TOTTRDQTY"] * 0.3 / 4 ** k).astype(np.int64)
+        bars.insert(0, "EXPIRY", exp.strftime("%Y-%m-%d"))
+        bars.insert(0, "DATE", dates.strftime("%Y-%m-%d"))
+        frames.append(bars)
+
+    return pd.concat(frames).sort_values(["DATE", "EXPIRY"], kind="stable")
+
+# ================= MAIN =================
+def generate(base, symbols, days, futures_share=FUTURES_SHARE, seed=0):
+    """Write the tree under base/data; returns (master rows, future rows)."""
+    rng = np.random.default_rng(seed)
+    master_dir = Path(base) / "data" / "master"
+    future_dir = Path(base) / "data" / "master_future"
+    master_dir.mkdir(parents=True, exist_ok=True)
+    future_dir.mkdir(parents=True, exist_ok=True)
+
+    dates = trading_days(days, rng)
+    expiry_dates = expiries(dates)
+    every = max(1, round(1 / futures_share)) if futures_share else 0
+
+    master_rows = future_rows = 0
+    for i in range(symbols):
+        symbol = f"SYM{i:05d}"
+
+        spot = daily_bars(len(dates), rng)
+        df = spot.copy()
+        df.insert(0, "DATE", dates.strftime("%Y-%m-%d"))
+        df.to_csv(master_dir / f"{symbol}.csv", index=False)
+        master_rows += len(df)
+
+        if every and i % every == 0:
+            fut = future_bars(dates, spot, expiry_dates, rng)
+            fut.to_csv(future_dir / f"{symbol}.csv", index=False)
+            future_rows += len(fut)
+
+    return master_rows, future_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic master / master_future data")
+    parser.add_argument("--base", required=True, help="root of the generated tree")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=750, help="trading days of history")
+    parser.add_argument("--futures-share", type=float, default=FUTURES_SHARE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    master_rows, future_rows = generate(
+        args.base, args.symbols, args.days, args.futures_share, args.seed
+    )
+
+    print(f"✅ master: {master_rows} rows, master_future: {future_rows} rows")
+    print(f"📁 Output: {Path(args.base) / 'data'}")
+    print(f"👉 export EXPIRY_ENGINE_BASE={args.base}")
+
+if __name__ == "__main__":
+    main()
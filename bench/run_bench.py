@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine
+Benchmark every scanner and candle builder on synthetic data
+
+✔ Generates a data tree per scale (bench/generate_data.py)
+✔ Runs each script as its own process against that tree (EXPIRY_ENGINE_BASE)
+✔ Reports wall time, input rows/sec and peak RSS per script
+   (RSS of the script's main process; --workers pool processes not included)
+✔ Stage totals per scale: generate / store / scan / build
+
+Usage:
+    python bench/run_bench.py --scales 100x250 500x750 2000x750
+    python bench/run_bench.py --scales 500x750 --store --workers 4 --json bench.jsonl
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from bench.generate_data import generate
+
+# One-shot scripts only (scan_daemon serves until stopped)
+SCANNERS = sorted(
+    p for p in (ROOT / "scanner").glob("scan_*.py") if p.stem != "scan_daemon"
+)
+BUILDERS = sorted((ROOT / "expiry").glob("build_*.py"))
+
+# Scanners reading master_future (rows/sec is computed on that tree)
+FUTURE_SCANNERS = {
+    "scan_engulfing_daily_future",
+    "scan_gravestone_doji_daily_future_3expiry",
+    "scan_gravestone_doji_daily_future_current",
+}
+
+# ================= PROCESS =================
+def peak_rss_psutil(proc):
+    # Fallback where os.wait4 is missing (Windows): poll the child's RSS
+    try:
+        import psutil
+    except ImportError:
+        proc.wait()
+        return None
+
+    peak = 0
+    try:
+        child = psutil.Process(proc.pid)
+        while proc.poll() is None:
+            peak = max(peak, child.memory_info().rss)
+            time.sleep(0.01)
+    except psutil.NoSuchProcess:
+        pass
+    proc.wait()
+    return peak or None
+
+
+def run(cmd, base):
+    """(seconds, peak RSS bytes or None, return code) of one child process."""
+    env = dict(os.environ, EXPIRY_ENGINE_BASE=str(base))
+    stderr = tempfile.TemporaryFile()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd, cwd=ROOT, env=env, stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL, stderr=stderr,
+    )
+
+    if hasattr(os, "wait4"):
+        # ru_maxrss: kilobytes on Linux, bytes on macOS
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        scale = 1 if sys.platform == "darwin" else 1024
+        peak = usage.ru_maxrss * scale
+    else:
+        peak = peak_rss_psutil(proc)
+
+    seconds = time.perf_counter() - start
+    if proc.returncode:
+        stderr.seek(0)
+        err = stderr.read().decode(errors="replace").strip()
+        print(f"❌ {' '.join(map(str, cmd[1:]))} failed:\n{err}")
+    stderr.close()
+    return seconds, peak, proc.returncode
+
+# ================= BENCH =================
+def bench_scale(symbols, days, base, args):
+    results = []
+
+    def record(stage, name, rows, seconds, peak, code=0):
+        result = {
+            "symbols": symbols, "days": days, "stage": stage, "script": name,
+            "rows": rows, "seconds": round(seconds, 3),
+            "rows_per_sec": round(rows / seconds) if seconds else None,
+            "peak_rss_mb": round(peak / 2 ** 20, 1) if peak else None,
+            "ok": code == 0,
+        }
+        results.append(result)
+        print_row(result)
+
+    start = time.perf_counter()
+    master_rows, future_rows = generate(base, symbols, days, seed=args.seed)
+    record("generate", "generate_data", master_rows + future_rows,
+           time.perf_counter() - start, None)
+
+    flags = ["--workers", str(args.workers)]
+    if args.compact:
+        flags.append("--compact")
+    if args.store:
+        flags.append("--store")
+        record("store", "engine.store", master_rows + future_rows,
+               *run([sys.executable, "-m", "engine.store"], base))
+
+    for script in SCANNERS:
+        rows = future_rows if script.stem in FUTURE_SCANNERS else master_rows
+        if script.stem in ("scan_all_daily", "scan_pattern_history"):
+            rows = master_rows + future_rows
+        record("scan", script.stem, rows,
+               *run([sys.executable, str(script)] + flags, base))
+
+    for script in BUILDERS:
+        record("build", script.stem, master_rows,
+               *run([sys.executable, str(script)] + flags, base))
+
+    return results
+
+# ================= REPORT =================
+HEADER = f"{'STAGE':<9}{'SCRIPT':<44}{'SECONDS':>9}{'ROWS/SEC':>12}{'PEAK MB':>9}"
+
+
+def print_row(r):
+    rate = f"{r['rows_per_sec']:,}" if r["rows_per_sec"] else "-"
+    peak = r["peak_rss_mb"] if r["peak_rss_mb"] is not None else "-"
+    flag = "" if r["ok"] else "  ❌"
+    print(f"{r['stage']:<9}{r['script']:<44}{r['seconds']:>9.2f}{rate:>12}{peak:>9}{flag}")
+
+
+def print_stages(results):
+    totals = {}
+    for r in results:
+        totals[r["stage"]] = totals.get(r["stage"], 0) + r["seconds"]
+    print("\n⏱  " + "  ".join(f"{stage}: {secs:.2f}s" for stage, secs in totals.items()))
+
+# ================= MAIN =================
+def parse_scale(text):
+    symbols, days = text.lower().split("x")
+    return int(symbols), int(days)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scanners and builders")
+    parser.add_argument(
+        "--scales", nargs="+", default=[(100, 250), (500, 750)], type=parse_scale,
+        help="SYMBOLSxDAYS per run (default: 100x250 500x750)",
+    )
+    parser.add_argument("--store", action="store_true", help="build + read the columnar store")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--compact", action="store_true", help="compact dtype load profile")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="where data trees go (default: a temp dir)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated trees")
+    parser.add_argument("--json", help="append results as JSON lines to this file")
+    args = parser.parse_args(argv)
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="expiry_bench_"))
+
+    all_results = []
+    for symbols, days in args.scales:
+        base = workdir / f"{symbols}x{days}"
+        if base.exists():
+            shutil.rmtree(base)
+
+        print(f"\n📊 {symbols} symbols × {days} days  ({base})\n")
+        print(HEADER)
+        results = bench_scale(symbols, days, base, args)
+        print_stages(results)
+        all_results += results
+
+        if not args.keep:
+            shutil.rmtree(base, ignore_errors=True)
+
+    if not args.keep and not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "a") as fh:
+            for r in all_results:
+                fh.write(json.dumps(r) + "\n")
+        print(f"\n📁 Results: {args.json}")
+
+if __name__ == "__main__":
+    main()
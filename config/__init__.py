@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Shared paths
+
+✔ One place for the data tree layout
+✔ EXPIRY_ENGINE_BASE overrides the default root
+"""
+
+import os
+from pathlib import Path
+
+# ================= PATHS =================
+BASE = Path(os.environ.get("EXPIRY_ENGINE_BASE", r"H:\ExpiryEngine"))
+DATA_DIR = BASE / "data"
+
+MASTER_DIR = DATA_DIR / "master"
+FUTURE_DIR = DATA_DIR / "master_future"
+REPORTS_DIR = DATA_DIR / "reports"
+
+WEEKLY_DIR = DATA_DIR / "weekly_candle_data"
+MONTHLY_DIR = DATA_DIR / "monthly_candle_data"
+WEEKLY_CHARTS_DIR = DATA_DIR / "weekly_charts"
+MONTHLY_CHARTS_DIR = DATA_DIR / "monthly_charts"
+
+# Columnar copy of master / master_future (engine.store)
+STORE_DIR = DATA_DIR / "store"
+STORE_MASTER_DIR = STORE_DIR / "master"
+STORE_FUTURE_DIR = STORE_DIR / "master_future"
+
+# SQLite copy of master / master_future for ad-hoc SQL (engine.sql)
+SQL_DB = STORE_DIR / "bars.sqlite"
+
+# Per-symbol futures expiry index (engine.expiry_index)
+STORE_FUTURE_INDEX_DIR = STORE_DIR / "master_future_index"
+
+# Exchange holidays, one date per line (engine.trading_calendar)
+HOLIDAYS_FILE = DATA_DIR / "holidays.csv"
+
+# Append-only scan results, every session (engine.results)
+RESULTS_DB = REPORTS_DIR / "signals.sqlite"
+
+# --profile run metrics (engine.metrics)
+PROFILE_DIR = REPORTS_DIR / "profile"
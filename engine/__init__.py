@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Shared scan engine
+
+✔ Loads each symbol once
+✔ Runs every registered pattern on the same frame
+✔ Used by scanner/ and expiry/ scripts
+"""
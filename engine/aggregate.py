@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Multi-timeframe candle aggregation
+
+✔ Daily bars → weekly / monthly / custom-anchored OHLCV candles
+✔ Bucket ids from the trading calendar (or an anchor date list),
+   candles from segment reductions (reduceat) on the sorted arrays
+✔ Every timeframe of a symbol from one load of its daily bars
+✔ Open / Close = first / last valid bar, High / Low / Volume skip gaps
+   (same as groupby first / max / min / last / sum)
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_DIR, MONTHLY_DIR, WEEKLY_DIR
+from engine.metrics import stage
+from engine.trading_calendar import MONTH, WEEK, trading_calendar
+
+
+@dataclass
+class Timeframe:
+    name: str
+    out_dir: Path
+    start_col: str
+    end_col: str
+    freq: str = None        # trading-calendar bucket (WEEK / MONTH)
+    anchors: object = None  # sorted dates; each one closes a bucket
+
+    def bucket_ids(self, dates):
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        if self.freq is not None:
+            return trading_calendar().buckets(dates, self.freq)
+        return np.searchsorted(self.anchors, dates, "left")
+
+
+TIMEFRAMES = {
+    "weekly": Timeframe("weekly", WEEKLY_DIR, "Week_Start", "Week_End", freq=WEEK),
+    "monthly": Timeframe("monthly", MONTHLY_DIR, "Month_Start", "Month_End", freq=MONTH),
+}
+
+
+def anchored(name, anchors):
+    """Custom timeframe: buckets end on each anchor date (e.g. expiries)."""
+    anchors = np.unique(pd.to_datetime(anchors).to_numpy().astype("datetime64[D]"))
+    return Timeframe(
+        name, DATA_DIR / f"{name}_candle_data", "Period_Start", "Period_End",
+        anchors=anchors,
+    )
+
+# ==================================================
+# SEGMENT REDUCTIONS
+# ==================================================
+def segments(ids):
+    # Start / end (exclusive) of each run of equal ids
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else ids[:0]
+    ends = np.r_[starts[1:], len(ids)]
+    return starts, ends
+
+
+def first_valid(x, starts, ends):
+    pos = np.where(np.isnan(x), len(x), np.arange(len(x)))
+    first = np.minimum.reduceat(pos, starts)
+    return np.where(first < ends, x[np.minimum(first, len(x) - 1)], np.nan)
+
+
+def last_valid(x, starts, ends):
+    pos = np.where(np.isnan(x), -1, np.arange(len(x)))
+    last = np.maximum.reduceat(pos, starts)
+    return np.where(last >= starts, x[last], np.nan)
+
+
+def keep_ints(values, like):
+    # Whole-number input stays integer when no bucket came out empty
+    if like.dtype.kind in "iu" and not np.isnan(values).any():
+        return values.astype(like.dtype)
+    return values
+
+# ==================================================
+# CANDLES
+# ==================================================
+def candles(daily, tf):
+    """daily: lower-case date/open/high/low/close[/tottrdqty] bars."""
+    with stage(f"aggregate:{tf.name}", rows=len(daily)):
+        return reduce_candles(daily, tf)
+
+
+def reduce_candles(daily, tf):
+    if not daily["date"].is_monotonic_increasing:
+        daily = daily.sort_values("date", kind="stable")
+    date = daily["date"].to_numpy()
+    starts, ends = segments(tf.bucket_ids(date))
+
+    if not len(starts):
+        cols = [tf.start_col, tf.end_col, "Open", "High", "Low", "Close"]
+        return pd.DataFrame(columns=cols + (["Volume"] if "tottrdqty" in daily else []))
+
+    o, h, l, c = (daily[col].to_numpy() for col in ("open", "high", "low", "close"))
+    out = {
+        tf.start_col: date[starts],
+        tf.end_col: date[ends - 1],
+        "Open": keep_ints(first_valid(o, starts, ends), o),
+        "High": np.fmax.reduceat(h, starts),
+        "Low": np.fmin.reduceat(l, starts),
+        "Close": keep_ints(last_valid(c, starts, ends), c),
+    }
+
+    if "tottrdqty" in daily:
+        # Missing volume counts as 0 (float sums, as the exact profile reads
+        # them); compact int32 / nullable Int32 volumes sum in 64 bits
+        vol = daily["tottrdqty"]
+        if vol.hasnans:
+            v = np.nan_to_num(vol.to_numpy(dtype=np.float64, na_value=np.nan))
+        else:
+            v = vol.to_numpy(dtype=np.float64 if vol.dtype.kind == "f" else np.int64)
+        out["Volume"] = np.add.reduceat(v, starts)
+
+    return pd.DataFrame(out)
+
+
+def all_candles(daily, timeframes):
+    # {name: candles} for every timeframe from one daily frame
+    return {tf.name: candles(daily, tf) for tf in timeframes}
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Batch candle chart rendering
+
+✔ One LineCollection for all wicks + one bar call for all bodies
+✔ One Figure / Agg canvas reused for every symbol of a shard
+✔ Symbol shards fanned out over a process pool (--workers)
+✔ Same layout and {symbol}_last_{N}.png names as the per-candle plots
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from engine.metrics import add_profile_arg, stage, start_profile
+from engine.parallel import run_sharded
+
+FIGSIZE = (10, 5)
+BODY_WIDTH = 0.6
+PRICE_COLS = ["Open", "High", "Low", "Close"]
+
+# ==================================================
+# PLOT
+# ==================================================
+def new_figure():
+    fig = Figure(figsize=FIGSIZE)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def draw_candles(ax, df, title):
+    ax.clear()
+
+    x = np.arange(len(df))
+    o, h, l, c = (df[col].to_numpy(dtype=float) for col in PRICE_COLS)
+
+    # Wicks: drawn over the bodies like the per-candle plt.plot lines
+    wicks = np.stack([np.column_stack([x, l]), np.column_stack([x, h])], axis=1)
+    ax.add_collection(LineCollection(
+        wicks, colors="black", linewidths=1, capstyle="projecting", zorder=2
+    ))
+
+    # Bodies
+    ax.bar(
+        x, c - o, bottom=o, width=BODY_WIDTH,
+        color=np.where(c >= o, "green", "red"),
+    )
+    ax.autoscale_view()
+
+    ax.set_title(title)
+    ax.set_xlabel("Candles")
+    ax.set_ylabel("Price")
+    ax.grid(alpha=0.3)
+
+
+def render_shard(files, candle_count, title, out_dir):
+    fig, ax = new_figure()
+
+    log = []
+    for file in files:
+        symbol = file.stem
+        with stage("read_csv", symbol, bytes=file.stat().st_size) as rec:
+            df = pd.read_csv(file, usecols=PRICE_COLS)
+            rec["rows"] = len(df)
+
+        if df.empty:
+            continue
+
+        with stage("render", symbol, rows=min(len(df), candle_count)):
+            draw_candles(ax, df.tail(candle_count), title.format(symbol))
+            fig.tight_layout()
+        with stage("save", symbol):
+            fig.savefig(out_dir / f"{symbol}_last_{candle_count}.png")
+
+        log.append(f"✓ {symbol}")
+
+    return log
+
+# ==================================================
+# MAIN
+# ==================================================
+def main(in_dir, out_dir, title, prompt, label, argv=None):
+    parser = argparse.ArgumentParser(description=f"Plot {label} candles for all symbols")
+    parser.add_argument("--count", type=int, help="last N candles (prompted if omitted)")
+    parser.add_argument("--workers", type=int, default=1)
+    add_profile_arg(parser)
+    args = parser.parse_args(argv)
+    start_profile(args.profile)
+
+    candle_count = args.count
+    if candle_count is None:
+        candle_count = int(input(prompt))
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    files = sorted(in_dir.glob("*.csv"))
+    print(f"\nProcessing {len(files)} symbols...\n")
+
+    for log in run_sharded(
+        render_shard, files, args.workers, candle_count, title, out_dir
+    ):
+        for msg in log:
+            print(msg)
+
+    print(f"\n✅ ALL SYMBOL {label.upper()} CHARTS CREATED")
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Resident scan service
+
+✔ Loads master / master_future once and keeps each symbol's bar series
+✔ Every request re-checks file mtimes; only changed symbols are reloaded
+✔ Any registered pattern answered from memory over local HTTP
+✔ Same columns + sort order as the scanner report CSVs
+
+Endpoints:
+    GET /patterns                              registered pattern names
+    GET /scan?pattern=gravestone_doji          report rows as CSV
+    GET /scan?pattern=engulfing,green_4&format=json
+    GET /reload                                drop the cache, load everything
+
+Split reports (gravestone_doji_future_3expiry) come back as one table
+with the EXPIRY column the scanner uses to name its files.
+"""
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from engine.io import memory_report, use_profile
+from engine.parallel import run_sharded
+from engine.patterns import pattern_name, patterns_for
+from engine.scan import SOURCE_DIRS, STORE_DIRS, detect, load_series, plan, to_frame
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Changed symbols below this are reloaded inline (no process pool start-up)
+POOL_MIN_FILES = 64
+
+# ==================================================
+# CACHE
+# ==================================================
+def load_symbols(paths, columns, depth, tail):
+    # One shard of files → {symbol: (mtime, {select: series})}, skip messages
+    loaded, skipped = {}, []
+    for path in paths:
+        mtime = path.stat().st_mtime
+        series, msgs = load_series([path], columns, depth, tail)
+        skipped += msgs
+        loaded[path.stem] = (mtime, series)
+    return loaded, skipped
+
+
+class Source:
+    """Bar series of every symbol in one data directory."""
+
+    def __init__(self, data_dir, suffix, patterns):
+        self.data_dir = data_dir
+        self.suffix = suffix
+        self.columns, self.depth, self.tail = plan(patterns)
+        self.symbols = {}
+
+    def load(self, paths, workers=1):
+        for loaded, skipped in run_sharded(
+            load_symbols, paths, workers, self.columns, self.depth, self.tail
+        ):
+            for msg in skipped:
+                print(msg)
+            self.symbols.update(loaded)
+
+    def refresh(self, workers=1):
+        # Reload symbols whose file changed / appeared, drop deleted ones
+        files = {p.stem: p for p in sorted(self.data_dir.glob(f"*{self.suffix}"))}
+
+        for symbol in set(self.symbols) - set(files):
+            del self.symbols[symbol]
+
+        changed = [
+            path for symbol, path in files.items()
+            if symbol not in self.symbols or
+            self.symbols[symbol][0] != path.stat().st_mtime
+        ]
+        if changed:
+            self.load(changed, workers if len(changed) >= POOL_MIN_FILES else 1)
+        return len(changed)
+
+    def series(self, select):
+        # Same order as a full scan: symbols sorted by file name
+        out = []
+        for symbol in sorted(self.symbols):
+            out += self.symbols[symbol][1][select]
+        return out
+
+
+class ScanService:
+    def __init__(self, patterns, source_dirs=SOURCE_DIRS, suffix=".csv", workers=1):
+        self.patterns = {p.name: p for p in patterns}
+        self.workers = workers
+        self.sources = {}
+        for source, data_dir in source_dirs.items():
+            group = [p for p in patterns if p.source == source]
+            if group:
+                self.sources[source] = Source(data_dir, suffix, group)
+
+    def refresh(self):
+        return sum(src.refresh(self.workers) for src in self.sources.values())
+
+    def reload(self):
+        for src in self.sources.values():
+            src.symbols.clear()
+        return self.refresh()
+
+    def scan(self, name):
+        pattern = self.patterns[name]
+        rows = detect(pattern, self.sources[pattern.source].series(pattern.select))
+        return to_frame(pattern, rows) if rows else pd.DataFrame()
+
+# ==================================================
+# HTTP
+# ==================================================
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def reply(self, code, body, content_type="application/json"):
+            data = body.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def error(self, code, message):
+            self.reply(code, json.dumps({"error": message}))
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+
+            if url.path == "/patterns":
+                return self.reply(200, json.dumps(sorted(service.patterns)))
+
+            if url.path == "/reload":
+                start = time.perf_counter()
+                loaded = service.reload()
+                return self.reply(200, json.dumps({
+                    "loaded": loaded, "seconds": round(time.perf_counter() - start, 3)
+                }))
+
+            if url.path != "/scan":
+                return self.error(404, f"unknown path {url.path}")
+
+            names = [n for v in query.get("pattern", []) for n in v.split(",") if n]
+            unknown = [n for n in names if n not in service.patterns]
+            if not names or unknown:
+                return self.error(400, f"unknown pattern(s): {unknown or 'none given'}")
+
+            fmt = query.get("format", ["csv"])[0]
+            if fmt == "csv" and len(names) > 1:
+                return self.error(400, "format=csv takes a single pattern")
+
+            service.refresh()
+            frames = {name: service.scan(name) for name in names}
+
+            if fmt == "csv":
+                return self.reply(200, frames[names[0]].to_csv(index=False), "text/csv")
+
+            return self.reply(200, json.dumps(
+                {name: df.to_dict("records") for name, df in frames.items()},
+                default=str,
+            ))
+
+    return Handler
+
+# ==================================================
+# MAIN
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resident pattern scan service")
+    parser.add_argument("--patterns", nargs="+", type=pattern_name, metavar="PATTERN")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--store", action="store_true", help="read the columnar store")
+    parser.add_argument("--workers", type=int, default=1, help="processes for (re)loads")
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="float32 / int32 / categorical load profile (engine.io)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compact:
+        use_profile("compact")
+
+    patterns = patterns_for(args.patterns)
+    if args.store:
+        service = ScanService(patterns, STORE_DIRS, ".parquet", args.workers)
+    else:
+        service = ScanService(patterns, workers=args.workers)
+
+    start = time.perf_counter()
+    loaded = service.refresh()
+    print(f"✅ Loaded {loaded} symbols in {time.perf_counter() - start:.2f}s")
+    report = memory_report()
+    if report:
+        print(report)
+
+    server = HTTPServer((args.host, args.port), make_handler(service))
+    print(f"👂 Listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Pattern expressions
+
+✔ Candle building blocks: O H L C V, RANGE, BODY, UPPER_WICK, LOWER_WICK,
+   TOP / BOTTOM of the body, GREEN / RED
+✔ .prev(k) = same expression k bars back; streak / rising / at_high
+   over the last n bars, any n (run-length kernels, engine.kernels)
+✔ Arithmetic, comparisons, & | combine them
+✔ compile_kernel → one vectorized NumPy expression per kind over the
+   panel arrays (engine.kernels layout: bars on the last axis)
+✔ Columns + depth a definition needs are read off the expression
+
+Shifts are pushed down to the columns: every shifted column is computed
+once and a missing bar (NaN) makes each comparison on it False. Use RED,
+not ~GREEN, where a missing bar must not match.
+
+    CLEAN_GREEN = GREEN & (UPPER_WICK <= 0.1 * RANGE) & (C > H.prev())
+"""
+
+import numpy as np
+
+from engine.kernels import high_run, rise_run, run_length, shift
+
+# Panel column order of derived pattern columns
+COLUMN_ORDER = ("OPEN", "HIGH", "LOW", "CLOSE", "TOTTRDQTY")
+
+# ==================================================
+# EXPRESSIONS
+# ==================================================
+class Expr:
+    """Node of a pattern expression: fmt filled with its rendered args."""
+
+    def __init__(self, fmt, *args):
+        self.fmt = fmt
+        self.args = [as_expr(a) for a in args]
+
+    def render(self, k, leaves):
+        return self.fmt.format(*(a.render(k, leaves) for a in self.args))
+
+    def prev(self, k=1):
+        return Shift(self, k)
+
+    def __bool__(self):
+        raise TypeError("pattern expressions don't chain: use (a < b) & (b < c)")
+
+    def __add__(self, other): return Expr("({} + {})", self, other)
+    def __radd__(self, other): return Expr("({} + {})", other, self)
+    def __sub__(self, other): return Expr("({} - {})", self, other)
+    def __rsub__(self, other): return Expr("({} - {})", other, self)
+    def __mul__(self, other): return Expr("({} * {})", self, other)
+    def __rmul__(self, other): return Expr("({} * {})", other, self)
+    def __truediv__(self, other): return Expr("({} / {})", self, other)
+    def __rtruediv__(self, other): return Expr("({} / {})", other, self)
+    def __neg__(self): return Expr("(-{})", self)
+    def __abs__(self): return Expr("np.abs({})", self)
+
+    def __lt__(self, other): return Expr("({} < {})", self, other)
+    def __le__(self, other): return Expr("({} <= {})", self, other)
+    def __gt__(self, other): return Expr("({} > {})", self, other)
+    def __ge__(self, other): return Expr("({} >= {})", self, other)
+    def __eq__(self, other): return Expr("({} == {})", self, other)
+    def __ne__(self, other): return Expr("({} != {})", self, other)
+
+    def __and__(self, other): return Expr("({} & {})", self, other)
+    def __rand__(self, other): return Expr("({} & {})", other, self)
+    def __or__(self, other): return Expr("({} | {})", self, other)
+    def __ror__(self, other): return Expr("({} | {})", other, self)
+    def __invert__(self): return Expr("(~{})", self)
+
+    __hash__ = object.__hash__
+
+
+class Col(Expr):
+    def __init__(self, name):
+        self.name = name
+
+    def render(self, k, leaves):
+        leaves.add((self.name, k))
+        return leaf_name(self.name, k)
+
+
+class Window(Expr):
+    """fmt over the last n bars of its arg: needs n - 1 more bars."""
+
+    def __init__(self, fmt, arg, n):
+        if n < 1:
+            raise ValueError("window of at least 1 bar")
+        super().__init__(fmt, arg)
+        self.n = n
+
+    def render(self, k, leaves):
+        found = set()
+        src = self.fmt.format(self.args[0].render(k, found), n=self.n)
+        leaves |= found
+        # Depth marker: column None at the oldest bar the window reaches
+        leaves.add((None, max((j for _, j in found), default=k) + self.n - 1))
+        return src
+
+
+class Const(Expr):
+    def __init__(self, value):
+        self.value = value
+
+    def render(self, k, leaves):
+        return repr(self.value)
+
+
+class Shift(Expr):
+    def __init__(self, expr, k):
+        if k < 0:
+            raise ValueError("prev() looks back only")
+        self.expr, self.k = expr, k
+
+    def render(self, k, leaves):
+        return self.expr.render(k + self.k, leaves)
+
+
+def as_expr(value):
+    if isinstance(value, Expr):
+        return value
+    if isinstance(value, (bool, int, float)):
+        return Const(value)
+    raise TypeError(f"not a pattern expression: {value!r}")
+
+
+def leaf_name(col, k):
+    return f"{col}_{k}"
+
+# ==================================================
+# BUILDING BLOCKS
+# ==================================================
+O = Col("OPEN")
+H = Col("HIGH")
+L = Col("LOW")
+C = Col("CLOSE")
+V = Col("TOTTRDQTY")
+
+
+def maximum(a, b):
+    return Expr("np.maximum({}, {})", a, b)
+
+
+def minimum(a, b):
+    return Expr("np.minimum({}, {})", a, b)
+
+
+RANGE = H - L
+BODY = abs(O - C)
+TOP = maximum(O, C)
+BOTTOM = minimum(O, C)
+UPPER_WICK = H - TOP
+LOWER_WICK = BOTTOM - L
+GREEN = C > O
+RED = C < O
+
+
+def streak(cond, n):
+    """cond held on each of the last n bars."""
+    return Window("(run_length({}) >= {n})", cond, n)
+
+
+def rising(x, n):
+    """x strictly rising over the last n bars (n=1: bar present)."""
+    return Window("(rise_run({}) >= {n})", x, n)
+
+
+def at_high(x, n):
+    """x is the high of the last n bars, all of them present."""
+    return Window("(high_run({}, {n}) >= {n})", x, n)
+
+# ==================================================
+# COMPILE
+# ==================================================
+def render(exprs):
+    """{key: expr} → ({key: source}, {(column, shift)})."""
+    leaves = set()
+    sources = {key: as_expr(e).render(0, leaves) for key, e in exprs.items()}
+    return sources, leaves
+
+
+def columns_of(*groups):
+    leaves = set()
+    depth = 1
+    for exprs in groups:
+        _, found = render(exprs)
+        leaves |= found
+    for _, k in leaves:
+        depth = max(depth, k + 1)
+    names = {col for col, _ in leaves if col is not None}
+    order = [c for c in COLUMN_ORDER if c in names]
+    order += sorted(names - set(order))
+    return order, depth
+
+
+def compile_kernel(exprs, name="pattern"):
+    """{key: expr} → kernel(panel) → {key: array}; .source holds the code."""
+    sources, leaves = render(exprs)
+    name = name if name.isidentifier() else "kernel"
+
+    lines = [f"def {name}(p):"]
+    for col, k in sorted(leaf for leaf in leaves if leaf[0] is not None):
+        value = f"shift(p[{col!r}], {k})" if k else f"p[{col!r}]"
+        lines.append(f"    {leaf_name(col, k)} = {value}")
+    lines.append('    with np.errstate(divide="ignore", invalid="ignore"):')
+    lines.append("        return {")
+    for key, src in sources.items():
+        lines.append(f"            {key!r}: {src},")
+    lines.append("        }")
+    source = "\n".join(lines) + "\n"
+
+    namespace = {
+        "np": np, "shift": shift,
+        "run_length": run_length, "rise_run": rise_run, "high_run": high_run,
+    }
+    exec(compile(source, f"<pattern {name}>", "exec"), namespace)
+    kernel = namespace[name]
+    kernel.source = source
+    return kernel
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Futures expiry index
+
+✔ Contract-major row order of a futures file: (EXPIRY, DATE) sorted
+✔ Each expiry → one contiguous, DATE-sorted range of that order
+✔ Active expiries as of every trading date (nearest first)
+✔ Front / next / far lookup = one binary search, no per-expiry scans
+✔ Contracts are iloc views of one contract-major copy of the frame
+   (gathered once per frame, shared by every selection on it)
+✔ Persisted next to the columnar store (python -m engine.store)
+✔ Universe-wide: expiry rank per (symbol, date) and front / next / far
+   contract series for a whole shard of symbols in one sorted pass
+✔ Both pick the same contracts: EXPIRY >= the file's last trading date,
+   nearest first
+"""
+
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from config import STORE_FUTURE_INDEX_DIR
+
+# ==================================================
+# INDEX
+# ==================================================
+class ExpiryIndex:
+    """
+    order         row numbers of the file in (EXPIRY, DATE) order
+    expiries      sorted unique expiries
+    starts, ends  range of each expiry inside `order`
+    first_dates   first trading date of each expiry
+    dates         sorted unique trading dates
+    active_ptr    CSR pointers: dates[i] → active_idx[ptr[i]:ptr[i + 1]]
+    active_idx    expiry positions active on each date, nearest first
+    """
+
+    FIELDS = (
+        "order", "expiries", "starts", "ends", "first_dates",
+        "dates", "active_ptr", "active_idx",
+    )
+
+    def __init__(self, **arrays):
+        for name in self.FIELDS:
+            setattr(self, name, arrays[name])
+        # (frame, frame in contract-major order) of the last frame sliced
+        self._major = None
+
+    def __len__(self):
+        return len(self.order)
+
+    def __deepcopy__(self, memo):
+        # Read-only; pandas deep-copies df.attrs on every derived frame
+        return self
+
+    def active(self, as_of=None):
+        # Expiry positions active on the last trading date <= as_of
+        if as_of is None:
+            i = len(self.dates) - 1
+        else:
+            i = np.searchsorted(self.dates, np.datetime64(as_of, "ns"), "right") - 1
+        if i < 0:
+            return self.active_idx[:0]
+        return self.active_idx[self.active_ptr[i]:self.active_ptr[i + 1]]
+
+    def rows(self, j):
+        return self.order[self.starts[j]:self.ends[j]]
+
+    def major(self, df):
+        # df in (EXPIRY, DATE) order: one gather, reused while df is alive
+        if self._major is None or self._major[0]() is not df:
+            self._major = (weakref.ref(df), df.take(self.order))
+        return self._major[1]
+
+    def contracts(self, df, n=None, as_of=None):
+        """[(expiry, DATE-sorted rows)] for the n nearest active expiries."""
+        major = self.major(df)
+        return [
+            (pd.Timestamp(self.expiries[j]), major.iloc[self.starts[j]:self.ends[j]])
+            for j in self.active(as_of)[:n]
+        ]
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as fh:
+            np.savez(fh, **{name: getattr(self, name) for name in self.FIELDS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in cls.FIELDS})
+
+# ==================================================
+# BUILD
+# ==================================================
+def build_index(df):
+    expiry = df["EXPIRY"].to_numpy().astype("datetime64[ns]")
+    date = df["DATE"].to_numpy().astype("datetime64[ns]")
+
+    # lexsort is stable: equal (EXPIRY, DATE) keep file order
+    order = np.lexsort((date, expiry))
+    expiries, starts = np.unique(expiry[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+    first_dates = (
+        np.fmin.reduceat(date[order], starts) if len(order) else date[:0]
+    )
+
+    # Active on d: expiry >= d and already traded by d (NaT never matches)
+    dates = np.unique(date[~np.isnat(date)])
+    active = (
+        (expiries[None, :] >= dates[:, None]) &
+        (first_dates[None, :] <= dates[:, None])
+    )
+    rows, cols = np.nonzero(active)
+
+    return ExpiryIndex(
+        order=order.astype(np.int64),
+        expiries=expiries,
+        starts=starts.astype(np.int64),
+        ends=ends.astype(np.int64),
+        first_dates=first_dates,
+        dates=dates,
+        active_ptr=np.searchsorted(rows, np.arange(len(dates) + 1)).astype(np.int64),
+        active_idx=cols.astype(np.int32),
+    )
+
+
+def index_path(symbol, index_dir=STORE_FUTURE_INDEX_DIR):
+    return index_dir / f"{symbol}.npz"
+
+
+def load_index(symbol, rows, index_dir=STORE_FUTURE_INDEX_DIR):
+    # Persisted index for a store file of `rows` rows (None if missing / stale)
+    path = index_path(symbol, index_dir)
+    if not path.exists():
+        return None
+
+    index = ExpiryIndex.load(path)
+    return index if len(index) == rows else None
+
+
+def indexed(df):
+    # Index attached by the store reader, else built once and attached
+    index = df.attrs.get("expiry_index")
+    if index is None or len(index) != len(df):
+        index = build_index(df)
+        df.attrs["expiry_index"] = index
+    return index
+
+# ==================================================
+# UNIVERSE
+# ==================================================
+def rank_expiries(owner, date, expiry):
+    """
+    Dense rank of each row's expiry among the rows of its (owner, date):
+    1 = front, 2 = next, 3 = far, ...; 0 where DATE / EXPIRY is missing.
+    """
+    order = np.lexsort((expiry, date, owner))
+    o, d, e = owner[order], date[order], expiry[order]
+
+    new_day = np.r_[True, (o[1:] != o[:-1]) | (d[1:] != d[:-1])]
+    new_expiry = new_day | np.r_[True, e[1:] != e[:-1]]
+
+    dense = np.cumsum(new_expiry)
+    day_base = np.maximum.accumulate(np.where(new_day, dense, 0))
+
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = dense - day_base + 1
+    ranks[np.isnat(date) | np.isnat(expiry)] = 0
+    return ranks
+
+
+def expiry_contracts(frames, max_rank=None, depth=None):
+    """
+    frames: [futures frame] (e.g. one per symbol). One pass over all of them
+    → [(frame position, expiry, DATE-sorted contract rows + EXPIRY_RANK)],
+    frame by frame, nearest expiry first.
+
+    max_rank: only the max_rank nearest expiries >= the frame's last date
+    depth:    only the last `depth` rows of each contract
+    """
+    frames = list(frames)
+    if not frames:
+        return []
+
+    lengths = np.array([len(df) for df in frames], dtype=np.int64)
+    panel = pd.concat(frames, ignore_index=True)
+    owner = np.repeat(np.arange(len(frames)), lengths)
+    date = panel["DATE"].to_numpy().astype("datetime64[ns]")
+    expiry = panel["EXPIRY"].to_numpy().astype("datetime64[ns]")
+    ranks = rank_expiries(owner, date, expiry)
+
+    # Contract-major order: (frame, EXPIRY, DATE); lexsort keeps file order on ties
+    order = np.lexsort((date, expiry, owner))
+    valid = ~np.isnat(expiry[order])
+    order = order[valid]
+    o, e = owner[order], expiry[order]
+    if not len(order):
+        return []
+
+    starts = np.flatnonzero(np.r_[True, (o[1:] != o[:-1]) | (e[1:] != e[:-1])])
+    ends = np.r_[starts[1:], len(order)]
+
+    keep = np.ones(len(starts), dtype=bool)
+    if max_rank is not None:
+        # Open on the frame's last trading date: EXPIRY >= that date, traded
+        # that day or not (NaT is the smallest int64 → never the maximum
+        # next to a real date; a frame without dates keeps nothing)
+        missing = np.iinfo(np.int64).min
+        last = np.full(len(frames), missing)
+        np.maximum.at(last, owner, date.view(np.int64))
+        c_owner, c_last = o[starts], last[o[starts]]
+        open_ = (c_last != missing) & (e[starts].view(np.int64) >= c_last)
+
+        # Contracts run (frame, EXPIRY)-sorted → rank = open ones so far in the frame
+        seen = np.cumsum(open_)
+        new_owner = np.r_[True, c_owner[1:] != c_owner[:-1]]
+        base = np.maximum.accumulate(np.where(new_owner, seen - open_, 0))
+        keep = open_ & (seen - base <= max_rank)
+
+    panel["EXPIRY_RANK"] = ranks
+    out = []
+    for start, end in zip(starts[keep], ends[keep]):
+        if depth is not None:
+            start = max(start, end - depth)
+        out.append((int(o[start]), pd.Timestamp(e[start]), panel.take(order[start:end])))
+    return out
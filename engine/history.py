@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Historical pattern detection (all dates)
+
+✔ Every pattern evaluated at every bar of every symbol
+✔ One vectorized pass per chunk: all series concatenated once for every pattern,
+   kernels shifted along the bar axis, symbol boundaries masked
+✔ Chunks sized to --max-memory; events stream to disk as sorted runs
+   (engine.pipeline) → flat RSS over any span of history
+✔ Futures: each contract is its own series; front / top expiries
+   = nearest expiries trading on that date (ranked chunk-wide at once)
+✔ Output: one event table (SYMBOL, DATE, PATTERN, TYPE, metrics)
+✔ --timeframe weekly|monthly runs over the aggregated candle files
+✔ --record backfills the results history (engine.results)
+✔ --candles N: green streaks of any length, still one pass per shard
+
+Usage:
+    python -m engine.history
+    python -m engine.history --patterns gravestone_doji --symbols RELIANCE
+    python -m engine.history --patterns green_4 --candles 10
+"""
+
+import argparse
+from functools import cached_property, partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import REPORTS_DIR
+from engine.io import memory_report, read_candles, read_symbol, use_profile
+from engine.metrics import add_profile_arg, stage, start_profile
+from engine.expiry_index import expiry_contracts
+from engine.patterns import (
+    CANDLE_COUNT, EXPIRY_RANKS, columns_for, has_cols, pattern_name,
+    patterns_for, whole, with_candles,
+)
+from engine.pipeline import MAX_MEMORY_MB, Budget, CountingReader, CsvSink, stream
+from engine.prefetch import add_prefetch_arg, prefetch, use_prefetch
+from engine.results import clear_events, connect, insert_events
+from engine.scan import SOURCE_DIRS, STORE_DIRS, TIMEFRAME_DIRS, TIMEFRAMES
+
+OUT_FILE = REPORTS_DIR / "pattern_history.csv"
+
+# ==================================================
+# SERIES
+# ==================================================
+def contracts(series):
+    # [(symbol, key, df)] → one DATE-sorted series per (symbol, expiry) with
+    # its rank among the symbol's expiries trading that day; one pass for all
+    futures = [(symbol, df) for symbol, _, df in series if has_cols(df, ("DATE", "EXPIRY"))]
+    return [
+        (futures[i][0], expiry, sub)
+        for i, expiry, sub in expiry_contracts(df for _, df in futures)
+    ]
+
+
+class Bars:
+    """
+    One chunk's [(symbol, key, frame)] concatenated once into 1-D arrays,
+    shared by every pattern's events(): owner = series index per bar,
+    pos = bar position inside its own series, panel = float64 columns
+    (NaN where a series lacks one), f32 = bars of compact float32 columns.
+    """
+
+    def __init__(self, series, columns):
+        self.series = series
+        lengths = np.array([len(df) for _, _, df in series], dtype=np.int64)
+        total = int(lengths.sum())
+
+        self.owner = np.repeat(np.arange(len(series)), lengths)
+        self.pos = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        self.symbols = np.array([symbol for symbol, _, _ in series], dtype=object)
+
+        self.panel, self.f32 = {}, {}
+        for col in columns:
+            parts = [
+                df[col].to_numpy(dtype=np.float64)
+                if col in df.columns else np.full(len(df), np.nan)
+                for _, _, df in series
+            ]
+            self.panel[col] = np.concatenate(parts) if parts else np.empty(0)
+            self.f32[col] = np.array([
+                col in df.columns and df[col].dtype == np.float32 for _, _, df in series
+            ], dtype=bool)[self.owner]
+
+    def __len__(self):
+        return len(self.series)
+
+    @cached_property
+    def dates(self):
+        return column(self.series, "DATE")
+
+    @cached_property
+    def ranks(self):
+        return column(self.series, "EXPIRY_RANK")
+
+    @cached_property
+    def expiries(self):
+        return column(self.series, "EXPIRY")
+
+    def panel_for(self, pattern):
+        # Series missing any of the pattern's columns read as all-NaN
+        missing = np.array([
+            not has_cols(df, pattern.columns) for _, _, df in self.series
+        ], dtype=bool)
+        panel = {col: self.panel[col] for col in pattern.panel_columns}
+        if missing.any():
+            bars = missing[self.owner]
+            for col, values in panel.items():
+                panel[col] = np.where(bars, np.nan, values)
+        return panel
+
+
+def column(series, col):
+    return np.concatenate([df[col].to_numpy() for _, _, df in series])
+
+
+def widen(values, f32):
+    # Compact-profile float32 → float64 via its shortest decimal: 104.28f → 104.28
+    if f32.any():
+        values = values.copy()
+        values[f32] = values[f32].astype(np.float32).astype(str).astype(np.float64)
+    return values
+
+# ==================================================
+# DETECT
+# ==================================================
+def events(pattern, bars):
+    if not len(bars):
+        return pd.DataFrame()
+
+    panel = bars.panel_for(pattern)
+    valid = bars.pos >= pattern.depth - 1
+
+    max_rank = EXPIRY_RANKS.get(pattern.select)
+    if max_rank is not None:
+        valid &= bars.ranks <= max_rank
+
+    metrics = pattern.metrics(panel) if pattern.metrics else {}
+
+    frames = []
+    for kind, mask in pattern.kernel(panel).items():
+        idx = np.flatnonzero(mask & valid)
+        if not len(idx):
+            continue
+
+        out = {
+            "SYMBOL": bars.symbols[bars.owner[idx]],
+            "DATE": bars.dates[idx],
+            "PATTERN": pattern.name,
+            "TYPE": kind,
+        }
+        if max_rank is not None:
+            out["EXPIRY"] = bars.expiries[idx]
+            out["EXPIRY_RANK"] = bars.ranks[idx]
+        for col in pattern.panel_columns:
+            out[col] = widen(panel[col][idx], bars.f32[col][idx])
+        for col, values in metrics.items():
+            out[col] = [round(v, 2) for v in values[idx].tolist()]
+
+        frames.append(pd.DataFrame(out))
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def history_chunk(paths, names, since, reader=read_symbol):
+    # One chunk of symbol files (engine.pipeline) → (events, skip messages)
+    patterns = patterns_for(names)
+    columns = columns_for(patterns)
+    by_contract = any(p.select is not whole for p in patterns)
+
+    whole_series, skipped = [], []
+    for path, load in prefetch(paths, partial(reader, columns=columns)):
+        symbol = path.stem
+        try:
+            whole_series.append((symbol, None, load()))
+        except Exception as e:
+            skipped.append(f"⚠️ Skipped {symbol}: {e}")
+
+    contract_series = []
+    if by_contract:
+        with stage("contracts") as rec:
+            contract_series = contracts(whole_series)
+            rec["rows"] = len(contract_series)
+
+    # Stacked once per chunk, shared by every pattern on those series
+    with stage("stack"):
+        stacked = {}
+        for by_expiry, series in ((False, whole_series), (True, contract_series)):
+            group = [p for p in patterns if (p.select is not whole) == by_expiry]
+            if group:
+                stacked[by_expiry] = Bars(series, panel_columns(group))
+
+    found = []
+    for p in patterns:
+        bars = stacked[p.select is not whole]
+        with stage(f"detect:{p.name}", rows=len(bars)):
+            found.append(events(p, bars))
+
+    found = [f for f in found if not f.empty]
+    out = pd.concat(found, ignore_index=True) if found else pd.DataFrame()
+    if since is not None and not out.empty:
+        out = out[out["DATE"] >= since]
+    return out, skipped
+
+
+def panel_columns(patterns):
+    # Every panel column of these patterns, first-seen order
+    return list(dict.fromkeys(c for p in patterns for c in p.panel_columns))
+
+
+def event_columns(patterns):
+    # Event table header: key columns, then each pattern's columns in order
+    columns = ["SYMBOL", "DATE", "PATTERN", "TYPE"]
+    for p in patterns:
+        extra = list(p.panel_columns)
+        if p.select in EXPIRY_RANKS:
+            extra = ["EXPIRY", "EXPIRY_RANK"] + extra
+        if p.metrics:
+            extra += list(p.metrics({c: np.empty(0) for c in p.panel_columns}))
+        for c in extra:
+            if c not in columns:
+                columns.append(c)
+    return columns
+
+
+def as_report(out):
+    out = out.copy()
+    out["DATE"] = out["DATE"].dt.date
+    if "EXPIRY" in out:
+        out["EXPIRY"] = pd.to_datetime(out["EXPIRY"]).dt.date
+    if "EXPIRY_RANK" in out:
+        out["EXPIRY_RANK"] = out["EXPIRY_RANK"].astype("Int64")
+    return out
+
+# ==================================================
+# MAIN
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pattern events at every date")
+    parser.add_argument("--patterns", nargs="+", type=pattern_name, metavar="PATTERN")
+    parser.add_argument("--symbols", nargs="+", help="limit to these symbols")
+    parser.add_argument("--since", help="drop events before this date")
+    parser.add_argument("--store", action="store_true", help="read the columnar store")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--timeframe", choices=TIMEFRAMES, default="daily")
+    parser.add_argument("--out", help=f"default: {OUT_FILE} (<timeframe>/ if not daily)")
+    parser.add_argument(
+        "--record", action="store_true",
+        help="replace these patterns' rows in the results history with the events",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="float32 / int32 / categorical load profile (engine.io)",
+    )
+    parser.add_argument(
+        "--candles", type=int, metavar="N",
+        help=f"green-streak patterns over N candles (default {CANDLE_COUNT})",
+    )
+    parser.add_argument(
+        "--max-memory", type=float, default=MAX_MEMORY_MB, metavar="MB",
+        help="soft ceiling on symbol frames loaded at once: chunks are sized "
+             "from a guessed bytes ratio until one is measured, and a file "
+             "larger than the limit still loads whole (engine.pipeline)",
+    )
+    add_prefetch_arg(parser)
+    add_profile_arg(parser)
+    args = parser.parse_args(argv)
+    start_profile(args.profile)
+
+    if args.compact:
+        use_profile("compact")
+    if args.prefetch is not None:
+        use_prefetch(args.prefetch)
+
+    if args.candles:
+        args.patterns = with_candles(args.patterns, args.candles)
+
+    dirs, suffix, reader = SOURCE_DIRS, ".csv", read_symbol
+    out_file = OUT_FILE
+    if args.timeframe != "daily":
+        if args.store:
+            parser.error("--store holds daily bars; drop it for --timeframe")
+        dirs, reader = TIMEFRAME_DIRS[args.timeframe], read_candles
+        out_file = REPORTS_DIR / args.timeframe / OUT_FILE.name
+    elif args.store:
+        dirs, suffix = STORE_DIRS, ".parquet"
+    if args.out:
+        out_file = Path(args.out)
+
+    since = pd.Timestamp(args.since) if args.since else None
+    wanted = {s.upper() for s in args.symbols} if args.symbols else None
+
+    patterns = patterns_for(args.patterns)
+    sink = CsvSink(out_file, event_columns(patterns), ["DATE", "PATTERN", "SYMBOL"])
+    conn = connect() if args.record else None
+
+    names_run = []
+    stored, written = 0, 0
+    try:
+        for source, data_dir in dirs.items():
+            names = [p.name for p in patterns if p.source == source]
+            if not names:
+                continue
+
+            files = sorted(data_dir.glob(f"*{suffix}"))
+            if wanted:
+                files = [f for f in files if f.stem.upper() in wanted]
+            print(f"🔍 History over {len(files)} symbols ({source})...")
+            names_run += names
+
+            if conn is not None:
+                symbols = [f.stem for f in files] if wanted else None
+                clear_events(conn, args.timeframe, names, symbols, since)
+
+            budget = Budget(args.max_memory, args.workers)
+            for part, skipped in stream(
+                history_chunk, files, budget, names, since, CountingReader(reader)
+            ):
+                for msg in skipped:
+                    print(msg)
+                if part.empty:
+                    continue
+                if conn is not None:
+                    stored += insert_events(conn, args.timeframe, part)
+                with stage("write", rows=len(part)):
+                    sink.write(as_report(part))
+
+        with stage("write", rows=sink.rows):
+            written = sink.close()
+        if conn is not None:
+            conn.commit()
+    finally:
+        sink.discard()
+        if conn is not None:
+            conn.close()
+
+    report = memory_report()
+    if report:
+        print(report)
+
+    if conn is not None and names_run:
+        print(f"🗄️ Results history: {stored} signals recorded")
+
+    if not written:
+        print("ℹ️ No pattern events found")
+        return
+
+    print(f"✅ Pattern events: {written}")
+    print(f"📁 Output: {out_file}")
+
+if __name__ == "__main__":
+    main()
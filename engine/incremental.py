@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Incremental candle builds
+
+✔ Remembers, per symbol, the last processed daily row (watermark)
+   and where the open weekly / monthly bucket starts
+✔ Next run reads only the daily rows from that bucket onward
+✔ Output CSV is truncated at the open bucket's line and appended to
+✔ Full rebuild when the daily file changed up to the watermark (byte
+   length + CRC32 of what the last build read, e.g. an ingest merging an
+   older day), the open bucket's rows changed, or the candle columns did
+"""
+
+import json
+import zlib
+
+import pandas as pd
+
+from engine.io import read_daily
+from engine.metrics import stage
+
+STATE_FILE = "_state.json"
+
+# Daily rows tailed on the first try (grows until the open bucket is covered)
+TAIL_HINT = 64
+
+PRICE_COLS = ["open", "high", "low", "close"]
+
+# Read size while checksumming a daily file
+FINGERPRINT_BLOCK = 1 << 20
+
+# ==================================================
+# STATE
+# ==================================================
+def load_state(out_dir):
+    state_file = out_dir / STATE_FILE
+    if not state_file.exists():
+        return {}
+    return json.loads(state_file.read_text())
+
+
+def save_state(out_dir, state):
+    (out_dir / STATE_FILE).write_text(json.dumps(state, indent=1, sort_keys=True))
+
+
+def clear_state(out_dir):
+    # Full rebuild without state: earlier offsets no longer describe the outputs
+    (out_dir / STATE_FILE).unlink(missing_ok=True)
+
+# ==================================================
+# HELPERS
+# ==================================================
+def write_candles(out_file, candles, offset=None):
+    """
+    Write candles (offset=None → whole file with header, else truncate at
+    offset and append). Returns the byte offset of the last candle line.
+    """
+    with stage("write", rows=len(candles)) as rec:
+        data = candles.to_csv(index=False, header=offset is None).encode("utf-8")
+        last_line = data.splitlines(keepends=True)[-1]
+
+        with open(out_file, "wb" if offset is None else "r+b") as fh:
+            if offset is not None:
+                fh.seek(offset)
+                fh.truncate()
+            start = fh.tell()
+            fh.write(data)
+        rec["bytes"] = len(data)
+
+    return start + len(data) - len(last_line)
+
+
+def fingerprint(file, size=None):
+    """(bytes, CRC32) of the first `size` bytes of file (all by default)."""
+    with stage("fingerprint", file.stem) as rec:
+        n, crc = 0, 0
+        with open(file, "rb") as fh:
+            while size is None or n < size:
+                want = FINGERPRINT_BLOCK if size is None else min(FINGERPRINT_BLOCK, size - n)
+                block = fh.read(want)
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+                n += len(block)
+        rec["bytes"] = n
+    return n, crc
+
+
+def read_since(file, start):
+    # Daily rows from `start` on, plus at least one row before it if any
+    k = TAIL_HINT
+    while True:
+        df = read_daily(file, tail=k)
+        if len(df) < k or df["date"].iloc[0] < start:
+            return df
+        k *= 4
+
+
+def make_entry(file, daily, candles, start_col, offset, mark=None):
+    # mark: fingerprint(file) when the caller already has it
+    last = daily.iloc[-1]
+    bucket_start = candles[start_col].iloc[-1]
+    size, crc = mark or fingerprint(file)
+
+    return {
+        "mtime": file.stat().st_mtime,
+        "bytes": size,
+        "crc32": crc,
+        "last_date": str(last["date"].date()),
+        "last_row": [float(last[c]) for c in PRICE_COLS],
+        "bucket_start": str(bucket_start.date()),
+        "bucket_rows": int((daily["date"] >= bucket_start).sum()),
+        "offset": offset,
+        "columns": list(candles.columns),
+    }
+
+# ==================================================
+# BUILD
+# ==================================================
+def build_full(file, out_file, build, start_col, daily=None, record=True):
+    """Whole output from the daily file → its state entry (None: record=False)."""
+    with stage("build", file.stem):
+        if daily is None:
+            daily = read_daily(file)
+
+        candles = build(daily)
+        offset = write_candles(out_file, candles)
+        if not record:
+            return None
+        return make_entry(file, daily, candles, start_col, offset)
+
+
+def build_incremental(file, out_file, build, start_col, entry):
+    """(entry, status) with status "up to date" / "updated" / "rebuilt"."""
+    with stage("build", file.stem):
+        return update(file, out_file, build, start_col, entry)
+
+
+def update(file, out_file, build, start_col, entry):
+    if not out_file.exists():
+        return build_full(file, out_file, build, start_col), "rebuilt"
+
+    if file.stat().st_mtime == entry["mtime"]:
+        return entry, "up to date"
+
+    # Everything up to the watermark byte for byte as last built, else
+    # an edit before the open bucket would go unnoticed
+    size = entry.get("bytes")
+    if size is None or fingerprint(file, size) != (size, entry.get("crc32")):
+        return build_full(file, out_file, build, start_col), "rebuilt"
+
+    bucket_start = pd.Timestamp(entry["bucket_start"])
+    last_date = pd.Timestamp(entry["last_date"])
+
+    df = read_since(file, bucket_start)
+    daily = df[df["date"] >= bucket_start].reset_index(drop=True)
+
+    # History check: open bucket rows up to the watermark are unchanged
+    seen = daily[daily["date"] <= last_date]
+    if (
+        len(seen) != entry["bucket_rows"] or
+        seen.empty or
+        seen["date"].iloc[-1] != last_date or
+        [float(v) for v in seen[PRICE_COLS].iloc[-1]] != entry["last_row"]
+    ):
+        return build_full(file, out_file, build, start_col), "rebuilt"
+
+    candles = build(daily)
+    if list(candles.columns) != entry.get("columns"):
+        # Output layout changed since the file was written
+        return build_full(file, out_file, build, start_col), "rebuilt"
+
+    offset = write_candles(out_file, candles, entry["offset"])
+    return make_entry(file, daily, candles, start_col, offset), "updated"
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Daily bhavcopy ingestion
+
+✔ One cross-sectional bhavcopy (equity or F&O, CSV or zipped) → each row
+   appended to its symbol's master / master_future file in one pass
+✔ Work per symbol ~ the day's rows: only the file tail is read to
+   deduplicate on (SYMBOL, DATE[, EXPIRY]); files stay DATE-sorted
+✔ A day older than a file's last bar is merged in (that file rewritten)
+✔ New rows keep each file's own DATE / EXPIRY layout (e.g. 16-OCT-2026)
+✔ Sort-order metadata (engine.sortmeta) kept current for touched files
+✔ Old (TIMESTAMP, EXPIRY_DT, ...) and UDiFF (TradDt, TckrSymb, ...) layouts
+✔ --store refreshes the columnar store + expiry index of touched symbols;
+   scanners / builders (--incremental) can run right after
+
+Usage:
+    python -m engine.ingest cm18OCT2026bhav.csv.zip fo18OCT2026bhav.csv.zip
+"""
+
+import argparse
+import csv
+import io
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from config import FUTURE_DIR, MASTER_DIR
+from engine.io import DATE_FORMAT, header_names, normalize_cols, normalize_name, read_tail
+from engine.sortmeta import load_meta, make_entry, save_meta, valid_entry
+
+# Bhavcopy column → master column (applied only when the target is missing)
+ALIASES = {
+    "TIMESTAMP": "DATE",
+    "TRADDT": "DATE",
+    "TCKRSYMB": "SYMBOL",
+    "SGMT": "SEGMENT",
+    "SCTYSRS": "SERIES",
+    "EXPIRY_DT": "EXPIRY",
+    "XPRYDT": "EXPIRY",
+    "FININSTRMTP": "INSTRUMENT",
+    "OPNPRIC": "OPEN",
+    "HGHPRIC": "HIGH",
+    "LWPRIC": "LOW",
+    "CLSPRIC": "CLOSE",
+    "TTLTRADGVOL": "TOTTRDQTY",
+    "CONTRACTS": "TOTTRDQTY",
+}
+
+EQUITY_SERIES = ("EQ",)
+EQUITY_INSTRUMENTS = ("STK", "EQ")
+FUTURES_INSTRUMENTS = ("FUTSTK", "FUTIDX", "STF", "IDF")
+
+# UDiFF segment → file kind
+SEGMENTS = {"CM": "equity", "FO": "futures"}
+
+# Header of files created for new symbols
+NEW_HEADERS = {
+    "equity": ["DATE", "OPEN", "HIGH", "LOW", "CLOSE", "TOTTRDQTY"],
+    "futures": ["DATE", "EXPIRY", "OPEN", "HIGH", "LOW", "CLOSE", "TOTTRDQTY"],
+}
+
+# Rows read back from each file to deduplicate a re-ingested day
+TAIL_ROWS = 64
+
+# Date layouts a master file may already use; new rows follow the file's
+# (first one that round-trips its last row wins, day-first before month-first)
+DATE_LAYOUTS = (
+    DATE_FORMAT, "%d-%b-%Y", "%d-%m-%Y", "%d/%m/%Y", "%m/%d/%Y",
+    "%Y/%m/%d", "%Y%m%d", "%Y-%m-%d %H:%M:%S",
+)
+
+# Bytes read back from a file's end to find its last row
+LAST_ROW_BYTES = 4096
+
+# ==================================================
+# BHAVCOPY
+# ==================================================
+def read_bhavcopy(path):
+    """→ ("equity" | "futures", rows as text, DATE / EXPIRY as DATE_FORMAT)."""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False, skipinitialspace=True)
+    df = normalize_cols(df)
+    df = df.loc[:, ~df.columns.str.startswith("UNNAMED")]
+
+    for src, dst in ALIASES.items():
+        if src in df.columns and dst not in df.columns:
+            df = df.rename(columns={src: dst})
+
+    df = df.apply(lambda col: col.str.strip())
+
+    kind = bhavcopy_kind(df, path)
+    if kind == "futures" and "INSTRUMENT" in df.columns:
+        df = df[df["INSTRUMENT"].isin(FUTURES_INSTRUMENTS)]
+    elif kind == "equity" and "SERIES" in df.columns:
+        df = df[df["SERIES"].isin(EQUITY_SERIES)]
+
+    keys = ["SYMBOL"] + key_cols(kind)
+    missing = [c for c in keys if c not in df.columns]
+    if missing:
+        raise ValueError(f"{path}: no {', '.join(missing)} column")
+
+    for col in key_cols(kind):
+        df[col] = pd.to_datetime(df[col], format="mixed").dt.strftime(DATE_FORMAT)
+
+    df = df[df["SYMBOL"] != ""].drop_duplicates(keys, keep="last")
+    return kind, df.reset_index(drop=True)
+
+
+def bhavcopy_kind(df, path):
+    # Segment (UDiFF), else instrument values, else an EXPIRY column (old F&O)
+    if "SEGMENT" in df.columns:
+        segments = set(df["SEGMENT"]) - {""}
+        kinds = {SEGMENTS.get(s) for s in segments}
+        if len(kinds) != 1 or None in kinds:
+            raise ValueError(f"{path}: unsupported segment {', '.join(sorted(segments))}")
+        return kinds.pop()
+
+    if "INSTRUMENT" in df.columns:
+        instruments = set(df["INSTRUMENT"])
+        if instruments & set(FUTURES_INSTRUMENTS):
+            return "futures"
+        if instruments & set(EQUITY_INSTRUMENTS):
+            return "equity"
+
+    return "futures" if "EXPIRY" in df.columns else "equity"
+
+
+def key_cols(kind):
+    return ["DATE", "EXPIRY"] if kind == "futures" else ["DATE"]
+
+# ==================================================
+# APPEND
+# ==================================================
+def date_layout(text):
+    # Stored date text → (strftime format, upper-case month) or None
+    for fmt in DATE_LAYOUTS:
+        try:
+            value = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        out = value.strftime(fmt)
+        if out == text:
+            return fmt, False
+        if out.upper() == text:
+            return fmt, True
+    return None
+
+
+def last_row(path):
+    # Last data row of a file as text fields (None: header only)
+    with open(path, "rb") as fh:
+        fh.seek(0, io.SEEK_END)
+        start = max(0, fh.tell() - LAST_ROW_BYTES)
+        fh.seek(start)
+        lines = fh.read().decode("utf-8-sig", errors="replace").splitlines()
+    if start == 0:
+        lines = lines[1:]
+    lines = [line for line in lines if line.strip()]
+    return next(csv.reader(lines[-1:]), None)
+
+
+def stored_layouts(header, row, keys):
+    # {key column: layout} of the dates already in a file (DATE_FORMAT if unknown)
+    names = [normalize_name(h) for h in header]
+    layouts = {}
+    for k in keys:
+        if row is None or k not in names or names.index(k) >= len(row):
+            continue
+        layout = date_layout(row[names.index(k)].strip())
+        if layout is not None:
+            layouts[k] = layout
+    return layouts
+
+
+def in_layouts(rows, layouts):
+    # DATE_FORMAT key columns → the target file's own date layout
+    rows = rows.copy()
+    for col, (fmt, upper) in layouts.items():
+        if fmt == DATE_FORMAT and not upper:
+            continue
+        text = pd.to_datetime(rows[col], format=DATE_FORMAT).dt.strftime(fmt)
+        rows[col] = text.str.upper() if upper else text
+    return rows
+
+
+def as_lines(rows, header, layouts=None):
+    # Day's rows in a file's own column order (missing columns left empty),
+    # DATE / EXPIRY written in the file's own layouts
+    if layouts:
+        rows = in_layouts(rows, layouts)
+    names = [normalize_name(h) for h in header]
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    for row in rows.to_dict("records"):
+        writer.writerow([row.get(n, "") for n in names])
+    return buf.getvalue()
+
+
+def ends_with_newline(path):
+    with open(path, "rb") as fh:
+        fh.seek(0, io.SEEK_END)
+        if fh.tell() == 0:
+            return True
+        fh.seek(-1, io.SEEK_END)
+        return fh.read(1) in (b"\n", b"\r")
+
+
+def stored_keys(frame, keys):
+    return set(zip(*(frame[k].dt.strftime(DATE_FORMAT) for k in keys)))
+
+
+def merge(path, rows, keys):
+    # Day older than the file's tail: rewrite this one file, DATE-sorted
+    old = pd.read_csv(path, dtype=str, keep_default_na=False)
+    names = [normalize_name(c) for c in old.columns]
+    if not old.empty:
+        rows = in_layouts(rows, stored_layouts(old.columns, old.iloc[-1].tolist(), keys))
+    new = pd.DataFrame(
+        [[row.get(n, "") for n in names] for row in rows.to_dict("records")],
+        columns=old.columns,
+    )
+
+    both = pd.concat([old, new], ignore_index=True)
+    order = {
+        k: pd.to_datetime(both[old.columns[names.index(k)]], format="mixed")
+        for k in keys
+    }
+    both = both.assign(**{f"_{k}": v for k, v in order.items()})
+    both = both.drop_duplicates([f"_{k}" for k in keys], keep="first")
+    both = both.sort_values([f"_{k}" for k in keys], kind="stable")
+
+    added = len(both) - len(old)
+    if added:
+        both.drop(columns=[f"_{k}" for k in keys]).to_csv(path, index=False)
+    return added
+
+
+def append_symbol(path, rows, kind):
+    """rows: one symbol's rows of the day → (status, rows written)."""
+    keys = key_cols(kind)
+
+    if not path.exists():
+        header = NEW_HEADERS[kind]
+        path.write_text(",".join(header) + "\n" + as_lines(rows, header))
+        return "new", len(rows)
+
+    header = header_names(path)
+    tail = read_tail(path, TAIL_ROWS, keys)
+    day = rows["DATE"].iloc[0]
+
+    if tail.empty or day > tail["DATE"].max().strftime(DATE_FORMAT):
+        fresh = rows
+    elif day == tail["DATE"].max().strftime(DATE_FORMAT) and (
+        len(tail) < TAIL_ROWS or tail["DATE"].min() < tail["DATE"].max()
+    ):
+        # Re-ingested day fully inside the tail → keep only unseen keys
+        seen = stored_keys(tail, keys)
+        fresh = rows[[k not in seen for k in zip(*(rows[k] for k in keys))]]
+    else:
+        added = merge(path, rows, keys)
+        return ("merged" if added else "duplicate"), added
+
+    if fresh.empty:
+        return "duplicate", 0
+
+    with open(path, "a", newline="") as fh:
+        if not ends_with_newline(path):
+            fh.write("\n")
+        fh.write(as_lines(fresh, header, stored_layouts(header, last_row(path), keys)))
+    return "appended", len(fresh)
+
+
+def ingest(path, master_dir=MASTER_DIR, future_dir=FUTURE_DIR):
+    kind, day = read_bhavcopy(path)
+    out_dir = future_dir if kind == "futures" else master_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    meta = load_meta(out_dir)
+    counts, written, touched = {}, 0, []
+    for symbol, rows in day.groupby("SYMBOL", sort=True):
+        for date, part in rows.groupby("DATE", sort=True):
+            out_file = out_dir / f"{symbol}.csv"
+            before = valid_entry(out_file, meta) if out_file.exists() else None
+            try:
+                status, n = append_symbol(out_file, part, kind)
+            except Exception as e:
+                print(f"⚠️ Skipped {symbol} {date}: {e}")
+                meta.pop(symbol, None)
+                continue
+
+            # New / merged files are written sorted + deduplicated; appends
+            # come after the last date and skip keys already in the tail
+            if status in ("new", "merged"):
+                meta[symbol] = make_entry(out_file, {"sorted": True, "unique": True})
+            elif status == "appended" and before is not None:
+                meta[symbol] = make_entry(out_file, {
+                    "sorted": before["sorted"], "unique": before["unique"]
+                })
+            elif status == "appended":
+                meta.pop(symbol, None)
+
+            counts[status] = counts.get(status, 0) + 1
+            written += n
+            if n:
+                touched.append(symbol)
+
+    save_meta(out_dir, meta)
+
+    dates = ", ".join(sorted(day["DATE"].unique())) or "no rows"
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"✅ {path.name} ({kind}, {dates}): {written} rows → {summary or 'nothing'}")
+    return kind, sorted(set(touched))
+
+# ==================================================
+# MAIN
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append daily bhavcopies to master data")
+    parser.add_argument("files", nargs="+", help="bhavcopy CSV / zip, oldest first")
+    parser.add_argument(
+        "--store", action="store_true",
+        help="refresh the columnar store (+ expiry index) afterwards",
+    )
+    args = parser.parse_args(argv)
+
+    kinds = set()
+    for name in args.files:
+        try:
+            kind, touched = ingest(Path(name))
+        except Exception as e:
+            print(f"❌ {name}: {e}")
+            continue
+        if touched:
+            kinds.add(kind)
+
+    if args.store:
+        from engine.store import STORES, build_store
+
+        for kind in sorted(kinds):
+            src_dir, store_dir, index_dir = STORES[
+                "master_future" if kind == "futures" else "master"
+            ]
+            build_store(src_dir, store_dir, index_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Master data I/O
+
+✔ NSE master / master_future CSV loading
+✔ Column names normalized once (DATE, OPEN, ...)
+✔ DATE / EXPIRY parsed, rows sorted by DATE (skipped for files known
+   or checked to be in order, engine.sortmeta)
+✔ Column projection for CSV and columnar store files
+✔ Tail reads: last N bars without parsing the full history
+✔ Load profiles: exact (default) / compact dtypes (--compact)
+✔ Weekly / monthly candle files read as DATE, OPEN, ..., TOTTRDQTY bars
+"""
+
+import io
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from engine.metrics import stage
+from engine.sortmeta import presorted
+
+# Bytes read per backwards step when tailing a file
+TAIL_BLOCK = 64 * 1024
+
+# Tail reads parse at least this many rows to check the DATE order
+TAIL_CHECK_ROWS = 32
+
+# ==================================================
+# LOAD PROFILES
+# ==================================================
+# exact:   inferred dtypes (float64 prices); reports match bit for bit
+# compact: float32 prices, int32 volumes, categorical text, DATE_FORMAT
+#          dates, pyarrow CSV parser when installed; float32 rounding can
+#          move a match sitting exactly on a threshold
+PROFILE_ENV = "EXPIRY_ENGINE_PROFILE"
+PROFILES = ("exact", "compact")
+
+PRICE_COLS = ("OPEN", "HIGH", "LOW", "CLOSE")
+VOLUME_COLS = ("TOTTRDQTY",)
+DATE_FORMAT = "%Y-%m-%d"
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = None
+
+# Bytes loaded in this process: [as exact dtypes, as loaded]
+_memory = [0, 0]
+_memory_lock = threading.Lock()
+
+
+def use_profile(name):
+    # Kept in the environment so pool workers (fork or spawn) see it too
+    os.environ[PROFILE_ENV] = name
+
+
+def compact_profile():
+    return os.environ.get(PROFILE_ENV, "exact") == "compact"
+
+
+def take_memory():
+    # Counters since the last call (pool workers send them back per shard)
+    with _memory_lock:
+        counts = list(_memory)
+        _memory[:] = [0, 0]
+    return counts
+
+
+def add_memory(counts):
+    # Prefetch threads (engine.prefetch) add concurrently
+    with _memory_lock:
+        _memory[0] += counts[0]
+        _memory[1] += counts[1]
+
+
+def memory_report():
+    exact, loaded = take_memory()
+    if not exact:
+        return None
+    return (
+        f"💾 Compact load: {loaded / 2**20:.1f} MB "
+        f"(exact dtypes {exact / 2**20:.1f} MB, {1 - loaded / exact:.0%} saved)"
+    )
+
+# ==================================================
+# HELPERS
+# ==================================================
+def normalize_name(name):
+    return name.strip().upper().replace("*", "")
+
+
+def normalize_cols(df):
+    df.columns = (
+        df.columns.str.strip()
+                  .str.upper()
+                  .str.replace("*", "", regex=False)
+    )
+    return df
+
+# ==================================================
+# LOAD
+# ==================================================
+def header_names(source):
+    if isinstance(source, io.BytesIO):
+        line = source.getvalue().split(b"\n", 1)[0]
+    else:
+        with open(source, "rb") as fh:
+            line = fh.readline()
+    return [c.strip('"') for c in line.decode("utf-8-sig").rstrip("\r\n").split(",")]
+
+
+def source_bytes(source):
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer().nbytes
+    return os.path.getsize(source)
+
+
+def parse_dates(values):
+    try:
+        return pd.to_datetime(values, format=DATE_FORMAT)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values)
+
+
+def whole_numbers(values):
+    present = values.dropna().to_numpy()
+    return bool(np.all(np.isfinite(present) & (present == np.floor(present))))
+
+
+def shrink(df):
+    # Exact-profile frame → compact dtypes, counting the bytes saved
+    exact = df.memory_usage(deep=True).sum()
+
+    for col in df.columns:
+        values = df[col]
+        kind = values.dtype.kind
+        if col in PRICE_COLS or col in VOLUME_COLS:
+            # Whole-number columns stay integers (same CSV text downstream)
+            if kind in "iu" and (values.empty or values.abs().max() < 2 ** 31):
+                df[col] = values.astype(np.int32)
+            elif kind == "f" and col in PRICE_COLS:
+                df[col] = values.astype(np.float32)
+            elif kind == "f" and whole_numbers(values):
+                # Volumes with gaps: nullable ints, float32 rounds past 2^24
+                small = values.empty or values.abs().max() < 2 ** 31
+                df[col] = values.astype("Int32" if small else "Int64")
+        elif kind not in "iufbM":
+            df[col] = values.astype("category")
+
+    add_memory([exact, df.memory_usage(deep=True).sum()])
+    return df
+
+
+def parse_csv(source, columns=None):
+    compact = compact_profile()
+
+    with stage("read_csv") as rec:
+        rec["bytes"] = source_bytes(source)
+        if compact and CSV_ENGINE:
+            # pyarrow takes usecols as a list of raw header names only
+            usecols = None
+            if columns is not None:
+                wanted = set(columns)
+                usecols = [c for c in header_names(source) if normalize_name(c) in wanted]
+            df = pd.read_csv(source, usecols=usecols, engine=CSV_ENGINE)
+        elif columns is None:
+            df = pd.read_csv(source)
+        else:
+            wanted = set(columns)
+            df = pd.read_csv(source, usecols=lambda c: normalize_name(c) in wanted)
+        rec["rows"] = len(df)
+
+    df = normalize_cols(df)
+    to_datetime = parse_dates if compact else pd.to_datetime
+
+    with stage("to_datetime"):
+        if "EXPIRY" in df.columns:
+            df["EXPIRY"] = to_datetime(df["EXPIRY"])
+
+        if "DATE" in df.columns:
+            df["DATE"] = to_datetime(df["DATE"])
+
+    if compact:
+        with stage("shrink"):
+            df = shrink(df)
+    return df
+
+
+def in_order(csv_file, df):
+    # Sort-order metadata first, else one O(n) pass over DATE
+    return presorted(Path(csv_file)) or df["DATE"].is_monotonic_increasing
+
+
+def read_master(csv_file, columns=None):
+    df = parse_csv(csv_file, columns)
+
+    if "DATE" in df.columns and not in_order(csv_file, df):
+        with stage("sort"):
+            df = df.sort_values("DATE").reset_index(drop=True)
+
+    return df
+
+# ==================================================
+# TAIL LOAD
+# ==================================================
+def tail_lines(csv_file, k):
+    """
+    Header, first data line and the last k data lines of a file,
+    read backwards from the end. Returns None when the tail covers
+    the whole file (a plain read is just as cheap then).
+    """
+    with open(csv_file, "rb") as fh:
+        header = fh.readline()
+        body_start = fh.tell()
+        first = fh.readline()
+
+        fh.seek(0, os.SEEK_END)
+        pos = fh.tell()
+        chunk = b""
+        lines = []
+
+        # First line of the chunk may be cut → only count the ones after it
+        while pos > body_start and len(lines) < k:
+            step = min(TAIL_BLOCK, pos - body_start)
+            pos -= step
+            fh.seek(pos)
+            chunk = fh.read(step) + chunk
+            lines = [line for line in chunk.splitlines()[1:] if line.strip()]
+
+    if pos <= body_start:
+        return None
+
+    return header, first, lines[-k:]
+
+
+def read_tail(csv_file, k, columns=None):
+    """
+    Last k DATE-sorted rows of a master file without parsing its history.
+    Falls back to a full read when the file does not look date-sorted.
+    Futures files (EXPIRY column) repeat DATE once per contract: their
+    tail must be DATE non-decreasing with unique (DATE, EXPIRY) instead.
+    """
+    parts = tail_lines(csv_file, max(k, TAIL_CHECK_ROWS))
+    if parts is None:
+        return read_master(csv_file, columns)
+
+    header, first, lines = parts
+    text = b"\n".join([header.rstrip(b"\r\n"), first.rstrip(b"\r\n")] + lines)
+    source = io.BytesIO(text)
+    futures = "EXPIRY" in {normalize_name(c) for c in header_names(source)}
+    wanted = columns
+    if futures and columns is not None and "EXPIRY" not in columns:
+        wanted = list(columns) + ["EXPIRY"]
+    df = parse_csv(source, wanted)
+
+    if "DATE" in df.columns:
+        first_date, dates = df["DATE"].iloc[0], df["DATE"].iloc[1:]
+        if futures:
+            unique = not df.iloc[1:].duplicated(["DATE", "EXPIRY"]).any()
+        else:
+            unique = dates.is_unique
+
+        # first row not later than the tail, tail rising (one row per key)
+        if first_date > dates.iloc[0] or not (
+            dates.is_monotonic_increasing and unique
+        ):
+            return read_master(csv_file, columns)
+
+    if wanted is not columns:
+        df = df.drop(columns="EXPIRY")
+    return df.iloc[1:].tail(k).reset_index(drop=True)
+
+def read_symbol(path, columns=None, tail=None):
+    with stage("read", path.stem) as rec:
+        if path.suffix == ".parquet":
+            from engine.store import read_store
+            with stage("read_parquet"):
+                df = read_store(path, columns, tail)
+            if compact_profile():
+                df = shrink(df)
+        elif tail is not None:
+            df = read_tail(path, tail, columns)
+        else:
+            df = read_master(path, columns)
+        rec["rows"] = len(df)
+    return df
+
+
+# Candle files (engine.aggregate) under the scanners' daily column names
+CANDLE_COLUMNS = {
+    "DATE": ("WEEK_START", "MONTH_START", "PERIOD_START"),
+    "TOTTRDQTY": ("VOLUME",),
+}
+
+
+def read_candles(path, columns=None, tail=None):
+    raw = None
+    if columns is not None:
+        raw = [name for c in columns for name in CANDLE_COLUMNS.get(c, (c,))]
+
+    df = read_symbol(path, raw, tail)
+    df = df.rename(columns={
+        name: col for col, names in CANDLE_COLUMNS.items() for name in names
+    })
+    if "DATE" in df.columns:
+        df["DATE"] = pd.to_datetime(df["DATE"])
+    return df
+
+
+def read_daily(path, tail=None):
+    # expiry/ builders work on lower-case daily columns
+    df = read_symbol(path, ("DATE", "OPEN", "HIGH", "LOW", "CLOSE", "TOTTRDQTY"), tail)
+    df.columns = df.columns.str.lower()
+    return df
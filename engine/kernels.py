@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Vectorized candle kernels
+
+✔ Work on float arrays with bars on the last axis
+   (symbols × days panel, or one symbol's full history)
+✔ Pattern kernels are compiled from engine.dsl expressions and
+   return boolean masks: True where the pattern completes on that bar
+✔ Bars before the start of the data are NaN → never match
+✔ Same float64 arithmetic as the per-row scanner checks
+✔ Run lengths (green streaks, rising volume, volume highs) in one
+   linear pass over full history: Numba-compiled when numba is
+   installed, NumPy otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# ==================================================
+# PANEL
+# ==================================================
+def build_panel(frames, columns, depth, required=None):
+    """
+    Right-align the last `depth` bars of every frame into
+    {column: array(len(frames), depth)}, NaN-padded on the left.
+    Frames missing any `required` column (default: `columns`) stay all-NaN.
+    """
+    panel = {col: np.full((len(frames), depth), np.nan) for col in columns}
+    required = set(required or columns)
+
+    for i, df in enumerate(frames):
+        if not required.issubset(df.columns):
+            continue
+
+        k = min(len(df), depth)
+        if k == 0:
+            continue
+
+        for col in columns:
+            panel[col][i, depth - k:] = df[col].to_numpy(dtype=np.float64)[-k:]
+
+    return panel
+
+# ==================================================
+# HELPERS
+# ==================================================
+def shift(x, k=1):
+    """Value k bars back along the last axis (NaN before the start)."""
+    if k == 0:
+        return x
+    out = np.full_like(x, np.nan)
+    out[..., k:] = x[..., :-k]
+    return out
+
+
+# ==================================================
+# RUNS
+# ==================================================
+# Per row of a (rows, bars) array; compiled by numba when available
+def run_length_loop(mask, out):
+    for r in range(mask.shape[0]):
+        n = 0
+        for i in range(mask.shape[1]):
+            n = n + 1 if mask[r, i] else 0
+            out[r, i] = n
+
+
+def rise_run_loop(x, out):
+    for r in range(x.shape[0]):
+        n = 0
+        prev = np.nan
+        for i in range(x.shape[1]):
+            v = x[r, i]
+            if v != v:
+                n = 0
+            elif n > 0 and v > prev:
+                n += 1
+            else:
+                n = 1
+            prev = v
+            out[r, i] = n
+
+
+def high_run_loop(x, out):
+    # Jump back over runs already known to be <= x[i]: O(bars) amortized
+    for r in range(x.shape[0]):
+        for i in range(x.shape[1]):
+            v = x[r, i]
+            if v != v:
+                out[r, i] = 0
+                continue
+            j = i - 1
+            while j >= 0 and out[r, j] > 0 and x[r, j] <= v:
+                j -= out[r, j]
+            out[r, i] = i - j
+
+
+if njit is not None:
+    run_length_loop = njit(cache=True)(run_length_loop)
+    rise_run_loop = njit(cache=True)(rise_run_loop)
+    high_run_loop = njit(cache=True)(high_run_loop)
+
+
+def run_rows(loop, x, dtype):
+    out = np.zeros(x.shape, dtype=np.int64)
+    if x.size:
+        loop(np.ascontiguousarray(x, dtype=dtype).reshape(-1, x.shape[-1]),
+             out.reshape(-1, x.shape[-1]))
+    return out
+
+
+def run_length(mask):
+    """Consecutive True bars ending at each bar (0 where False)."""
+    mask = np.asarray(mask, dtype=bool)
+    if njit is not None:
+        return run_rows(run_length_loop, mask, np.bool_)
+
+    idx = np.arange(mask.shape[-1])
+    last_false = np.maximum.accumulate(np.where(mask, -1, idx), axis=-1)
+    return idx - last_false
+
+
+def rise_run(x):
+    """Bars in the strictly rising run ending at each bar (0 where NaN)."""
+    if njit is not None:
+        return run_rows(rise_run_loop, x, np.float64)
+
+    return np.where(np.isnan(x), 0, run_length(x > shift(x)) + 1)
+
+
+def high_run(x, n):
+    """
+    Bars ending at each bar that are all present and <= it, capped at n:
+    >= n where the bar is the high of the last n bars.
+    """
+    if njit is not None:
+        return np.minimum(run_rows(high_run_loop, x, np.float64), n)
+
+    ok = ~np.isnan(x)
+    out = ok.astype(np.int64)
+    for k in range(1, n):
+        ok &= shift(x, k) <= x
+        out += ok
+    return out
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Run metrics (--profile)
+
+✔ Per-stage / per-symbol timings: read_csv, to_datetime, sort, detect,
+   aggregate, write, render, ...
+✔ Rows processed, bytes read / written, peak RSS with every record
+✔ Pool workers collect their own records; shards hand them back
+   (engine.parallel) → one timeline per run
+✔ Output: JSON lines (PROFILE_DIR/<script>_<time>.jsonl) + summary table
+   (printed and saved next to it as .txt)
+✔ Off by default: a disabled stage costs one environment lookup
+
+Stages nest (read_csv runs inside load): totals per stage overlap,
+per-symbol totals only add up the outermost stages. Stages run on
+prefetch threads are recorded as prefetch:<stage> and left out of the
+per-symbol totals; the loop's wait for the frame is its "read".
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import PROFILE_DIR
+
+# Unix only; Windows falls back to psutil (if installed) or no RSS
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Set for the whole run → pool workers (fork or spawn) record too
+METRICS_ENV = "EXPIRY_ENGINE_METRICS"
+
+SLOWEST_SYMBOLS = 10
+
+_records = []
+
+# Symbol + nesting depth of the open stages, per thread (engine.prefetch
+# reads on threads); prefix of stages recorded in the background
+_local = threading.local()
+
+# ==================================================
+# RECORD
+# ==================================================
+def enabled():
+    return METRICS_ENV in os.environ
+
+
+def rss_mb(maxrss):
+    # ru_maxrss: KB on Linux, bytes on macOS
+    return round(maxrss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def peak_rss_mb():
+    if resource is not None:
+        return rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    # peak_wset: Windows peak working set
+    return round(getattr(info, "peak_wset", info.rss) / 2**20, 1)
+
+
+def children_rss_mb():
+    if resource is None:
+        return None
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return rss_mb(children) if children else None
+
+
+@contextmanager
+def stage(name, symbol=None, **counts):
+    """
+    Time one stage: with stage("read_csv", bytes=n) as rec: ... rec["rows"] = k
+    Nested stages inherit the enclosing symbol.
+    """
+    rec = dict(counts)
+    if not enabled():
+        yield rec
+        return
+
+    outer = getattr(_local, "symbol", None)
+    if symbol is not None:
+        _local.symbol = symbol
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        seconds = time.perf_counter() - start
+        _local.depth = depth
+        prefix = getattr(_local, "prefix", None)
+        if prefix:
+            rec["background"] = True
+        _records.append({
+            "stage": (prefix or "") + name,
+            "symbol": getattr(_local, "symbol", None),
+            "depth": depth,
+            "seconds": round(seconds, 6),
+            "pid": os.getpid(),
+            "peak_rss_mb": peak_rss_mb(),
+            **rec,
+        })
+        _local.symbol = outer
+
+
+@contextmanager
+def background(prefix):
+    """
+    Stages run inside (on a helper thread) are recorded as prefix + name:
+    their time overlaps the main loop, which times its own wait instead.
+    """
+    _local.prefix = prefix
+    try:
+        yield
+    finally:
+        _local.prefix = None
+
+
+def take_metrics():
+    # Records since the last call (pool workers send them back per shard)
+    out = list(_records)
+    _records.clear()
+    return out
+
+
+def add_metrics(records):
+    _records.extend(records)
+
+# ==================================================
+# SUMMARY
+# ==================================================
+def summarize(records):
+    stages = {}
+    symbols = {}
+    for r in records:
+        s = stages.setdefault(r["stage"], {
+            "calls": 0, "seconds": 0.0, "max": 0.0, "rows": 0, "bytes": 0, "rss": None,
+        })
+        s["calls"] += 1
+        s["seconds"] += r["seconds"]
+        s["max"] = max(s["max"], r["seconds"])
+        s["rows"] += r.get("rows") or 0
+        s["bytes"] += r.get("bytes") or 0
+        if r["peak_rss_mb"] is not None:
+            s["rss"] = max(s["rss"] or 0.0, r["peak_rss_mb"])
+
+        if r["symbol"] is not None and r["depth"] == 0 and not r.get("background"):
+            symbols[r["symbol"]] = symbols.get(r["symbol"], 0.0) + r["seconds"]
+
+    width = max([len(name) for name in stages] + [5]) + 2
+    lines = [
+        f"{'STAGE':<{width}}{'CALLS':>8}{'TOTAL s':>10}{'MEAN ms':>10}{'MAX ms':>10}"
+        f"{'ROWS':>12}{'MB':>10}{'PEAK RSS MB':>13}"
+    ]
+    for name, s in sorted(stages.items(), key=lambda kv: -kv[1]["seconds"]):
+        lines.append(
+            f"{name:<{width}}{s['calls']:>8}{s['seconds']:>10.3f}"
+            f"{s['seconds'] / s['calls'] * 1000:>10.2f}{s['max'] * 1000:>10.2f}"
+            f"{s['rows']:>12}{s['bytes'] / 2**20:>10.1f}"
+            f"{'' if s['rss'] is None else format(s['rss'], '.1f'):>13}"
+        )
+
+    slowest = sorted(symbols.items(), key=lambda kv: -kv[1])[:SLOWEST_SYMBOLS]
+    if slowest:
+        lines.append("")
+        lines.append("Slowest symbols (s): " + ", ".join(
+            f"{symbol} {seconds:.3f}" for symbol, seconds in slowest
+        ))
+    return "\n".join(lines)
+
+# ==================================================
+# RUN
+# ==================================================
+def add_profile_arg(parser):
+    parser.add_argument(
+        "--profile", nargs="?", const="", metavar="FILE",
+        help=f"per-stage metrics as JSON lines (default file under {PROFILE_DIR})",
+    )
+
+
+def start_profile(path, name=None):
+    """Turn recording on for this process + its workers; report at exit."""
+    if path is None:
+        return
+    name = name or Path(sys.argv[0]).stem
+    if not path:
+        path = PROFILE_DIR / f"{name}_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+    os.environ[METRICS_ENV] = str(path)
+    started = time.perf_counter()
+    atexit.register(finish_profile, Path(path), name, started)
+
+
+def finish_profile(path, name, started):
+    records = take_metrics()
+    records.append({
+        "stage": "run",
+        "symbol": None,
+        "depth": -1,
+        "script": name,
+        "seconds": round(time.perf_counter() - started, 6),
+        "pid": os.getpid(),
+        "peak_rss_mb": peak_rss_mb(),
+        "workers_peak_rss_mb": children_rss_mb(),
+    })
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as fh:
+        for r in records:
+            fh.write(json.dumps(r) + "\n")
+
+    summary = summarize(records)
+    path.with_suffix(".txt").write_text(summary + "\n")
+
+    print(f"\n⏱️ Profile ({name})\n{summary}")
+    print(f"📁 Metrics: {path}")
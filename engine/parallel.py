@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Process-pool sharding
+
+✔ Splits a sorted file list into contiguous shards
+✔ Runs one shard per task on a process pool
+✔ Results come back in shard order → same order as a sequential run
+✔ Workers' load memory counters and --profile records are folded back
+   into the parent
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.io import add_memory, take_memory
+from engine.metrics import add_metrics, take_metrics
+
+# Shards per worker (smaller shards balance uneven symbol sizes)
+SHARDS_PER_WORKER = 4
+
+# ==================================================
+# HELPERS
+# ==================================================
+def shard(items, n):
+    size = max(1, -(-len(items) // n))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def run_task(func, items, args):
+    return func(items, *args), take_memory(), take_metrics()
+
+# ==================================================
+# RUN
+# ==================================================
+def run_sharded(func, items, workers, *args):
+    """
+    func(shard, *args) for every shard; list of results in shard order.
+    workers <= 1 runs inline on a single shard.
+    """
+    if workers <= 1 or len(items) <= 1:
+        return [func(items, *args)]
+
+    shards = shard(items, workers * SHARDS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_task, func, s, args) for s in shards]
+        results = []
+        for f in futures:
+            result, memory, metrics = f.result()
+            add_memory(memory)
+            add_metrics(metrics)
+            results.append(result)
+        return results
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Pattern registry
+
+✔ Every EOD candle pattern in one place
+✔ Detection = vectorized kernel over a symbols × bars panel
+✔ Patterns defined as candle expressions (engine.dsl), compiled to
+   one NumPy expression per kind; columns + depth derived
+✔ Report rows built only for the matches
+✔ Report file + sort order live with the pattern
+"""
+
+import argparse
+import re
+from dataclasses import dataclass
+from functools import partial
+
+from engine import dsl
+from engine.dsl import (
+    BODY, BOTTOM, GREEN, LOWER_WICK, RANGE, RED, TOP, UPPER_WICK,
+    C, O, V, at_high, rising, streak,
+)
+from engine.expiry_index import indexed
+
+# ==================================================
+# PARAMETERS
+# ==================================================
+# Gravestone doji (pure candle)
+BODY_PCT_MAX = 0.2       # body <= 20% of range
+LOWER_WICK_MAX = 0.2    # lower wick <= 20% of range
+UPPER_WICK_MIN = 0.6    # upper wick >= 60% of range
+
+# Morning / evening star
+STRONG_BODY_MIN = 0.6   # candle body >= 60% of range
+SMALL_BODY_MAX = 0.3   # candle body <= 30% of range
+
+# Green streaks
+CANDLE_COUNT = 4
+
+# Futures
+MAX_EXPIRIES = 3
+
+# ==================================================
+# REGISTRY
+# ==================================================
+MASTER = "master"
+MASTER_FUTURE = "master_future"
+
+# Load projections (pattern columns are derived from its expressions)
+OHLC = ("DATE", "OPEN", "HIGH", "LOW", "CLOSE")
+OHLC_EXPIRY = OHLC + ("EXPIRY",)
+
+# Never fed to kernels
+DATE_COLS = ("DATE", "EXPIRY")
+
+
+@dataclass
+class Pattern:
+    name: str
+    source: str
+    out_file: str
+    label: str
+    columns: tuple
+    depth: int
+    kernel: object
+    emit: object
+    select: object
+    sort_by: object = None
+    ascending: bool = True
+    split_by: str = None
+    metrics: object = None
+
+    @property
+    def panel_columns(self):
+        return [c for c in self.columns if c not in DATE_COLS]
+
+
+PATTERNS = {}
+
+
+def register(name, source, out_file, label, columns, depth, emit,
+             select=None, sort_by=None, ascending=True, split_by=None,
+             metrics=None):
+    def wrap(kernel):
+        PATTERNS[name] = Pattern(
+            name, source, out_file, label, columns, depth, kernel, emit,
+            select or whole, sort_by, ascending, split_by, metrics
+        )
+        return kernel
+    return wrap
+
+
+def patterns_for(names=None):
+    if names is None:
+        return list(PATTERNS.values())
+    for name in names:
+        m = STREAK_NAME.match(name)
+        if name not in PATTERNS and m:
+            streak_patterns(int(m.group(1)))
+    return [PATTERNS[name] for name in names]
+
+
+def columns_for(patterns):
+    columns = []
+    for p in patterns:
+        columns += [c for c in p.columns if c not in columns]
+    return columns
+
+# ==================================================
+# HELPERS
+# ==================================================
+def has_cols(df, cols):
+    return set(cols).issubset(df.columns)
+
+
+# ==================================================
+# SERIES SELECTION
+# ==================================================
+# select(df) → [(key, frame)]: the bar series a pattern is run on.
+def whole(df):
+    return [(None, df)]
+
+
+# Futures: expiries still open on the last trading date, nearest first
+def front_expiry(df):
+    if not has_cols(df, OHLC_EXPIRY):
+        return []
+    return indexed(df).contracts(df, 1)
+
+
+def top_expiries(df):
+    if not has_cols(df, OHLC_EXPIRY):
+        return []
+    return indexed(df).contracts(df, MAX_EXPIRIES)
+
+
+# Expiry selections → highest expiry rank they keep on each date; a shard
+# of symbols is selected at once with engine.expiry_index.expiry_contracts
+EXPIRY_RANKS = {
+    front_expiry: 1,
+    top_expiries: MAX_EXPIRIES,
+}
+
+# ==================================================
+# REPORT ROWS
+# ==================================================
+# emit(tail, symbol, kind, key) → one report row for a match on tail's last bar
+def emit_candle(tail, symbol, kind, key):
+    curr = tail.iloc[-1]
+    return {
+        "SYMBOL": symbol,
+        "DATE": curr["DATE"].date(),
+        "TYPE": kind,
+        "OPEN": curr["OPEN"],
+        "HIGH": curr["HIGH"],
+        "LOW": curr["LOW"],
+        "CLOSE": curr["CLOSE"]
+    }
+
+
+def emit_gravestone(tail, symbol, kind, key):
+    last = tail.iloc[-1]
+
+    o, h, l, c = last["OPEN"], last["HIGH"], last["LOW"], last["CLOSE"]
+    rng = h - l
+    body = abs(o - c)
+    upper_wick = h - max(o, c)
+    lower_wick = min(o, c) - l
+
+    row = {"SYMBOL": symbol}
+    if key is not None:
+        row["EXPIRY"] = key.date()
+
+    row.update({
+        "DATE": last["DATE"].date(),
+        "OPEN": o,
+        "HIGH": h,
+        "LOW": l,
+        "CLOSE": c,
+        "UPPER_WICK_%": round(float(upper_wick / rng * 100), 2),
+        "BODY_%": round(float(body / rng * 100), 2),
+        "LOWER_WICK_%": round(float(lower_wick / rng * 100), 2)
+    })
+    return row
+
+
+def emit_star(tail, symbol, kind, key):
+    c1, c2, c3 = (tail.iloc[i] for i in (-3, -2, -1))
+    return {
+        "SYMBOL": symbol,
+        "DATE": c3["DATE"].date(),
+        "PATTERN": kind,
+        "C1_DATE": c1["DATE"].date(),
+        "C2_DATE": c2["DATE"].date(),
+        "C3_DATE": c3["DATE"].date()
+    }
+
+
+# Streak rows: n = streak length (bound per pattern with partial)
+def emit_green(tail, symbol, kind, key, n=CANDLE_COUNT):
+    last = tail.tail(n)
+    return {
+        "SYMBOL": symbol,
+        "D1_OPEN": last.iloc[0]["OPEN"],
+        "D1_CLOSE": last.iloc[0]["CLOSE"],
+        f"D{n}_CLOSE": last.iloc[-1]["CLOSE"],
+    }
+
+
+def emit_volume_confirm(tail, symbol, kind, key, n=CANDLE_COUNT):
+    last = tail.tail(n)
+    return {
+        "SYMBOL": symbol,
+        f"VOL_D{n}": last["TOTTRDQTY"].tolist()[-1],
+        f"CLOSE_D{n}": last.iloc[-1]["CLOSE"],
+    }
+
+
+def emit_volume_increasing(tail, symbol, kind, key, n=CANDLE_COUNT):
+    last = tail.tail(n)
+
+    row = {"SYMBOL": symbol}
+    for i, vol in enumerate(last["TOTTRDQTY"].tolist(), start=1):
+        row[f"VOL_D{i}"] = vol
+    row[f"CLOSE_D{n}"] = last.iloc[-1]["CLOSE"]
+    return row
+
+# ==================================================
+# HISTORY METRICS
+# ==================================================
+# metrics → {column: expression}; extra event-table columns (engine.history)
+WICK_METRICS = {
+    "UPPER_WICK_%": UPPER_WICK / RANGE * 100,
+    "BODY_%": BODY / RANGE * 100,
+    "LOWER_WICK_%": LOWER_WICK / RANGE * 100,
+}
+
+VOLUME_METRICS = {"TOTTRDQTY": V}
+
+# ==================================================
+# DEFINITIONS
+# ==================================================
+# {kind: expression} (engine.dsl); one expression → kind None
+ENGULFING = {
+    "BULLISH": RED.prev() & GREEN & (BOTTOM <= BOTTOM.prev()) & (TOP >= TOP.prev()),
+    "BEARISH": GREEN.prev() & RED & (BOTTOM <= BOTTOM.prev()) & (TOP >= TOP.prev()),
+}
+
+GRAVESTONE_DOJI = (
+    (RANGE > 0) &
+    (BODY <= BODY_PCT_MAX * RANGE) &
+    (LOWER_WICK <= LOWER_WICK_MAX * RANGE) &
+    (UPPER_WICK >= UPPER_WICK_MIN * RANGE)
+)
+
+STAR_SHAPE = (
+    (RANGE.prev(2) > 0) & (RANGE.prev() > 0) & (RANGE > 0) &
+    (BODY.prev(2) >= STRONG_BODY_MIN * RANGE.prev(2)) &
+    (BODY.prev() <= SMALL_BODY_MAX * RANGE.prev()) &
+    (BODY >= STRONG_BODY_MIN * RANGE)
+)
+STAR_MIDPOINT = (O.prev(2) + C.prev(2)) / 2
+
+MORNING_EVENING_STAR = {
+    "MORNING_STAR": STAR_SHAPE & RED.prev(2) & GREEN & (C >= STAR_MIDPOINT),
+    "EVENING_STAR": STAR_SHAPE & GREEN.prev(2) & RED & (C <= STAR_MIDPOINT),
+}
+
+
+def define(name, source, out_file, label, kinds, emit, columns=None,
+           select=None, sort_by=None, ascending=True, split_by=None,
+           metrics=None):
+    """
+    Register a pattern from expressions: kernel, metrics, load columns and
+    depth compiled / derived from them. `columns` adds what emit reads.
+    """
+    if not isinstance(kinds, dict):
+        kinds = {None: kinds}
+
+    derived, depth = dsl.columns_of(kinds, metrics or {})
+    expiry = ("EXPIRY",) if select in EXPIRY_RANKS else ()
+    columns = tuple(columns or ("DATE",))
+    columns += tuple(c for c in derived + list(expiry) if c not in columns)
+
+    if metrics is not None:
+        metrics = dsl.compile_kernel(metrics, f"{name}_metrics")
+
+    return register(
+        name, source, out_file, label, columns, depth, emit, select,
+        sort_by, ascending, split_by, metrics,
+    )(dsl.compile_kernel(kinds, name))
+
+# ==================================================
+# EQUITY PATTERNS
+# ==================================================
+define(
+    "engulfing", MASTER, "engulfing_{timeframe}.csv", "Engulfing candles",
+    ENGULFING, emit_candle, columns=OHLC, sort_by=["TYPE", "SYMBOL"],
+)
+
+define(
+    "gravestone_doji", MASTER, "gravestone_doji_{timeframe}.csv", "Gravestone Doji",
+    GRAVESTONE_DOJI, emit_gravestone, sort_by="UPPER_WICK_%", ascending=False,
+    metrics=WICK_METRICS,
+)
+
+define(
+    "morning_evening_star", MASTER, "morning_evening_star_{timeframe}.csv",
+    "Morning / Evening Star", MORNING_EVENING_STAR, emit_star,
+    sort_by=["PATTERN", "SYMBOL"],
+)
+
+# Green streaks of any length: green_<n>[_volume_confirm | _volume_increasing]
+STREAK_NAME = re.compile(r"green_(\d+)(_volume_confirm|_volume_increasing)?$")
+
+
+def streak_patterns(n):
+    """Register the green-streak patterns for n candles → their names."""
+    if n < 1:
+        raise ValueError(f"streak of {n} candles")
+
+    names = [f"green_{n}", f"green_{n}_volume_confirm", f"green_{n}_volume_increasing"]
+    if names[0] in PATTERNS:
+        return names
+
+    green = streak(GREEN, n)
+
+    define(
+        names[0], MASTER, f"green_candle_{n}_day/scan_last_{n}_green_{{timeframe}}.csv",
+        f"{n}-green symbols", green, partial(emit_green, n=n),
+    )
+
+    define(
+        names[1], MASTER,
+        f"green_{n}_volume_confirm/scan_{n}_green_volume_confirm_{{timeframe}}.csv",
+        f"{n}-green volume-confirm symbols",
+        green & at_high(V, n), partial(emit_volume_confirm, n=n),
+        metrics=VOLUME_METRICS,
+    )
+
+    define(
+        names[2], MASTER,
+        f"green_{n}_volume_inc/scan_{n}_green_volume_increasing_{{timeframe}}.csv",
+        f"{n}-green volume-increasing symbols",
+        green & rising(V, n), partial(emit_volume_increasing, n=n),
+        metrics=VOLUME_METRICS,
+    )
+    return names
+
+
+def pattern_name(name):
+    """argparse type for --patterns: registered names + any green_<n> streak."""
+    m = STREAK_NAME.match(name)
+    if name in PATTERNS or (m and int(m.group(1)) >= 1):
+        return name
+    raise argparse.ArgumentTypeError(
+        f"unknown pattern {name!r} (choose from {', '.join(sorted(PATTERNS))}, "
+        "or green_<n>[_volume_confirm | _volume_increasing])"
+    )
+
+
+def with_candles(names, n):
+    """names (None = all) with the green-streak patterns switched to n candles."""
+    out = []
+    for name in names or [p.name for p in patterns_for()]:
+        m = STREAK_NAME.match(name)
+        if m:
+            name = f"green_{n}{m.group(2) or ''}"
+        if name not in out:
+            out.append(name)
+    return out
+
+
+streak_patterns(CANDLE_COUNT)
+
+# ==================================================
+# FUTURES PATTERNS
+# ==================================================
+define(
+    "engulfing_future", MASTER_FUTURE, "engulfing_{timeframe}_future.csv",
+    "Futures Engulfing candles", ENGULFING, emit_candle, columns=OHLC,
+    sort_by=["TYPE", "SYMBOL"],
+)
+
+define(
+    "gravestone_doji_future_current", MASTER_FUTURE,
+    "gravestone_doji_{timeframe}_future_current.csv", "Futures Gravestone Doji",
+    GRAVESTONE_DOJI, emit_gravestone, select=front_expiry,
+    sort_by="UPPER_WICK_%", ascending=False, metrics=WICK_METRICS,
+)
+
+define(
+    "gravestone_doji_future_3expiry", MASTER_FUTURE,
+    "gravestone_doji_future_3expiry/gravestone_doji_{}.csv",
+    "Futures Gravestone Doji (top expiries)", GRAVESTONE_DOJI, emit_gravestone,
+    select=top_expiries, sort_by="UPPER_WICK_%", ascending=False,
+    split_by="EXPIRY", metrics=WICK_METRICS,
+)
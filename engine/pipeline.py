@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Bounded-memory streaming pipeline
+
+✔ source → normalize → detect → sink, one chunk of symbols at a time
+✔ Chunks cut from file sizes so the frames a chunk loads stay under
+   --max-memory MB (shared by the chunks in flight); the file bytes →
+   frame bytes ratio is re-learned from every loaded chunk
+✔ At most `workers` chunks in flight on the pool, results in file order
+   → same output as one pass over everything
+✔ Sinks take each chunk's rows as they come: sorted outputs are spooled
+   as sorted runs on disk and merged at close (numeric / text keys,
+   ascending or descending, missing values last like sort_values)
+✔ --max-memory is a soft limit: chunks are cut from a START_RATIO guess
+   until the first chunk is measured, and one file larger than the
+   limit still loads whole
+✔ RSS stays flat with universe size: one chunk's frames + one row per
+   run while merging
+"""
+
+import csv
+import functools
+import heapq
+import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pandas.api.types import is_numeric_dtype
+
+from engine.io import add_memory
+from engine.metrics import add_metrics
+from engine.parallel import SHARDS_PER_WORKER, run_task
+
+# Default ceiling on frames loaded at once (all chunks in flight)
+MAX_MEMORY_MB = 128
+
+# Frame bytes per file byte before the first chunk is measured
+START_RATIO = 4.0
+
+# Frame bytes loaded by the current chunk (this process; prefetch
+# threads add concurrently)
+_loaded = [0]
+_loaded_lock = threading.Lock()
+
+# ==================================================
+# SOURCE
+# ==================================================
+class Budget:
+    """Cuts a file list into chunks whose loaded frames fit the ceiling."""
+
+    def __init__(self, max_mb=MAX_MEMORY_MB, workers=1):
+        # Chunks alive at once: in flight on the pool + the one detected
+        alive = workers + 1 if workers > 1 else 1
+        self.limit = max_mb * 2**20 / alive
+        self.workers = workers
+        self.ratio = START_RATIO
+
+    def chunks(self, files):
+        # Pool runs keep several chunks per worker (balances uneven symbols)
+        most = len(files)
+        if self.workers > 1:
+            most = max(1, -(-len(files) // (self.workers * SHARDS_PER_WORKER)))
+
+        chunk, size = [], 0
+        for path in files:
+            n = path.stat().st_size
+            if chunk and (len(chunk) >= most or (size + n) * self.ratio > self.limit):
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(path)
+            size += n
+        if chunk:
+            yield chunk
+
+    def learn(self, chunk, loaded):
+        size = sum(path.stat().st_size for path in chunk)
+        if size and loaded:
+            self.ratio = loaded / size
+
+# ==================================================
+# NORMALIZE
+# ==================================================
+class CountingReader:
+    """reader(path, columns, tail) that adds each frame's bytes to the chunk."""
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def __call__(self, path, columns=None, tail=None):
+        df = self.reader(path, columns, tail)
+        nbytes = int(df.memory_usage(index=True).sum())
+        with _loaded_lock:
+            _loaded[0] += nbytes
+        return df
+
+
+def run_chunk(chunk, func, args):
+    _loaded[0] = 0
+    result = func(chunk, *args)
+    return result, _loaded[0]
+
+
+def stream(func, files, budget, *args):
+    """
+    func(chunk, *args) per chunk of files → yields results in file order.
+    Pass CountingReader(reader) in args so the budget learns chunk sizes.
+    """
+    chunks = budget.chunks(files)
+
+    if budget.workers <= 1:
+        for chunk in chunks:
+            result, loaded = run_chunk(chunk, func, args)
+            budget.learn(chunk, loaded)
+            yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=budget.workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(run_task, run_chunk, chunk, (func, args))))
+            if len(pending) < budget.workers:
+                continue
+            yield collect(budget, *pending.popleft())
+
+        while pending:
+            yield collect(budget, *pending.popleft())
+
+
+def collect(budget, chunk, future):
+    (result, loaded), memory, metrics = future.result()
+    add_memory(memory)
+    add_metrics(metrics)
+    budget.learn(chunk, loaded)
+    return result
+
+# ==================================================
+# SINK
+# ==================================================
+@functools.total_ordering
+class Descending:
+    """Text sort key in reverse order."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+
+class CsvSink:
+    """
+    Report CSV written chunk by chunk. With sort_by, each chunk is a sorted
+    run on disk and close() merges them (ties keep chunk order, like a
+    stable sort of everything). Sort columns numeric in the first chunk
+    compare as numbers, the rest as text; ascending as in sort_values.
+    columns=None: the first chunk's columns.
+    """
+
+    def __init__(self, path, columns=None, sort_by=None, ascending=True):
+        self.path = Path(path)
+        self.columns = None if columns is None else list(columns)
+        self.sort_by = [sort_by] if isinstance(sort_by, str) else sort_by
+        self.ascending = ascending
+        self.numeric = None
+        self.rows = 0
+        self.runs = []
+        self.spool = None
+
+    @property
+    def part(self):
+        return self.path.with_name(self.path.name + ".part")
+
+    def write(self, df):
+        if df.empty:
+            return
+        if self.columns is None:
+            self.columns = list(df.columns)
+        df = df.reindex(columns=self.columns)
+        first = self.rows == 0
+        self.rows += len(df)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.sort_by is None:
+            df.to_csv(self.part, mode="w" if first else "a", header=first, index=False)
+            return
+
+        if self.spool is None:
+            self.spool = Path(tempfile.mkdtemp(prefix=".runs_", dir=self.path.parent))
+            self.numeric = [is_numeric_dtype(df[c]) for c in self.sort_by]
+        run = self.spool / f"{len(self.runs):06d}.csv"
+        df = df.sort_values(self.sort_by, ascending=self.ascending, kind="stable")
+        df.to_csv(run, index=False)
+        self.runs.append(run)
+
+    def close(self):
+        """Move the finished file into place → rows written (0: no file)."""
+        if self.runs:
+            self.merge(self.part)
+        if self.rows:
+            os.replace(self.part, self.path)
+        self.discard()
+        return self.rows
+
+    def sort_key(self):
+        # CSV row → key ordering rows as the runs were sorted
+        idx = [self.columns.index(c) for c in self.sort_by]
+        ascending = self.ascending
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(idx)
+
+        def key(row):
+            out = []
+            for i, numeric, up in zip(idx, self.numeric, ascending):
+                text = row[i]
+                if text == "":
+                    out.append((1, 0))
+                    continue
+                value = float(text) if numeric else text
+                if not up:
+                    value = -value if numeric else Descending(value)
+                out.append((0, value))
+            return out
+
+        return key
+
+    def merge(self, out_file):
+        key = self.sort_key()
+        handles = [open(run, newline="") for run in self.runs]
+        try:
+            readers = [csv.reader(fh) for fh in handles]
+            for reader in readers:
+                next(reader)
+            with open(out_file, "w", newline="") as out:
+                writer = csv.writer(out, lineterminator=os.linesep)
+                writer.writerow(self.columns)
+                writer.writerows(heapq.merge(*readers, key=key))
+        finally:
+            for fh in handles:
+                fh.close()
+
+    def discard(self):
+        if self.spool is not None:
+            shutil.rmtree(self.spool, ignore_errors=True)
+            self.spool = None
+        self.runs = []
+        if self.part.exists():
+            self.part.unlink()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Scan results history
+
+✔ Every scanner run appends its signals to one SQLite file (RESULTS_DB)
+✔ Rows clustered on (timeframe, date, pattern, symbol); second index on
+   (timeframe, pattern, symbol, date) for per-pattern / per-symbol queries
+✔ Idempotent per trading day: re-running a session replaces its rows
+✔ Scans stage signals chunk by chunk and record each session at the end
+✔ Every session a scan ran on is kept, with or without signals
+   → "last N sessions" counts days the scanners saw, not days with hits
+✔ engine.history --record backfills past sessions
+
+Usage:
+    python -m engine.results --pattern engulfing --type BULLISH --sessions 60
+    python -m engine.results --pattern green_4 --since 2026-10-01 --min-hits 3
+"""
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from config import RESULTS_DB
+
+KEY_COLS = ("DATE", "PATTERN", "SYMBOL", "TYPE", "EXPIRY")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    timeframe TEXT NOT NULL,
+    date      TEXT NOT NULL,
+    pattern   TEXT NOT NULL,
+    symbol    TEXT NOT NULL,
+    expiry    TEXT NOT NULL DEFAULT '',
+    type      TEXT NOT NULL DEFAULT '',
+    row       TEXT NOT NULL,
+    PRIMARY KEY (timeframe, date, pattern, symbol, expiry, type)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS signals_pattern_symbol
+    ON signals (timeframe, pattern, symbol, date);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    timeframe TEXT NOT NULL,
+    date      TEXT NOT NULL,
+    pattern   TEXT NOT NULL,
+    PRIMARY KEY (timeframe, date, pattern)
+) WITHOUT ROWID;
+"""
+
+# A scan's signals until its session is known (engine.scan streams chunks)
+STAGED = """
+CREATE TEMP TABLE IF NOT EXISTS staged (
+    timeframe TEXT, date TEXT, pattern TEXT, symbol TEXT,
+    expiry TEXT, type TEXT, row TEXT,
+    PRIMARY KEY (timeframe, date, pattern, symbol, expiry, type)
+)
+"""
+
+# ==================================================
+# CONNECT
+# ==================================================
+def connect(path=RESULTS_DB):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def as_text(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if hasattr(value, "date") and callable(value.date):
+        value = value.date()
+    return str(value)
+
+
+def as_json(value):
+    # numpy scalars → plain numbers, dates → ISO text
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def payload(row):
+    # Report row minus the columns stored as keys
+    return {k: v for k, v in row.items() if k not in KEY_COLS}
+
+# ==================================================
+# WRITE
+# ==================================================
+def record(conn, timeframe, pattern, session, signals):
+    """
+    One scan of one pattern. session: the trading day scanned (latest bar);
+    signals: [(symbol, date, kind, key, row)]. The session's earlier rows
+    for this pattern are replaced; late rows of stale symbols are upserted.
+    """
+    stage_signals(conn, timeframe, pattern, signals)
+    return record_staged(conn, timeframe, pattern, session)
+
+
+def stage_signals(conn, timeframe, pattern, signals):
+    # One chunk of a scan's signals, held in a temp table until record_staged
+    conn.execute(STAGED)
+    rows = [
+        (
+            timeframe, as_text(date), pattern, symbol, as_text(key), as_text(kind),
+            json.dumps(payload(row), default=as_json),
+        )
+        for symbol, date, kind, key, row in signals
+    ]
+    conn.executemany("INSERT OR REPLACE INTO staged VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def record_staged(conn, timeframe, pattern, session):
+    """Staged signals of one pattern → its session, replaced as in record()."""
+    conn.execute(STAGED)
+    with conn:
+        if session is None:
+            conn.execute(
+                "DELETE FROM staged WHERE timeframe = ? AND pattern = ?",
+                (timeframe, pattern),
+            )
+            return 0
+
+        session = as_text(session)
+        conn.execute(
+            "DELETE FROM signals WHERE timeframe = ? AND date = ? AND pattern = ?",
+            (timeframe, session, pattern),
+        )
+        stored = conn.execute(
+            "INSERT OR REPLACE INTO signals "
+            "SELECT * FROM staged WHERE timeframe = ? AND pattern = ?",
+            (timeframe, pattern),
+        ).rowcount
+        conn.execute(
+            "DELETE FROM staged WHERE timeframe = ? AND pattern = ?",
+            (timeframe, pattern),
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO sessions VALUES (?, ?, ?)",
+            (timeframe, session, pattern),
+        )
+    return stored
+
+
+def clear_events(conn, timeframe, patterns, symbols=None, since=None):
+    # Stored rows of these patterns (limited to symbols / dates >= since)
+    where = ["timeframe = ?", f"pattern IN ({','.join('?' * len(patterns))})"]
+    params = [timeframe] + list(patterns)
+    if symbols:
+        where.append(f"symbol IN ({','.join('?' * len(symbols))})")
+        params += list(symbols)
+    if since is not None:
+        where.append("date >= ?")
+        params.append(as_text(since))
+    conn.execute(f"DELETE FROM signals WHERE {' AND '.join(where)}", params)
+
+
+def insert_events(conn, timeframe, events):
+    # One chunk of the engine.history event table; caller commits
+    rows, sessions = [], set()
+    if not events.empty:
+        extras = events.drop(columns=[c for c in KEY_COLS if c in events])
+        for (_, event), extra in zip(events.iterrows(), extras.to_dict("records")):
+            date = as_text(event["DATE"])
+            rows.append((
+                timeframe, date, event["PATTERN"], event["SYMBOL"],
+                as_text(event.get("EXPIRY")), as_text(event.get("TYPE")),
+                json.dumps({k: v for k, v in extra.items() if not pd.isna(v)},
+                           default=as_json),
+            ))
+            sessions.add((timeframe, date, event["PATTERN"]))
+
+    conn.executemany("INSERT OR REPLACE INTO signals VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.executemany("INSERT OR IGNORE INTO sessions VALUES (?, ?, ?)", sorted(sessions))
+    return len(rows)
+
+
+def record_events(conn, timeframe, patterns, events, symbols=None, since=None):
+    """
+    engine.history event table → signals. Replaces every stored row of
+    these patterns (limited to symbols / dates >= since when given).
+    """
+    with conn:
+        clear_events(conn, timeframe, patterns, symbols, since)
+        return insert_events(conn, timeframe, events)
+
+# ==================================================
+# QUERY
+# ==================================================
+def session_start(conn, timeframe, n, pattern=None):
+    # First date of the last n sessions scanned (None: fewer than n stored)
+    sql = "SELECT DISTINCT date FROM sessions WHERE timeframe = ?"
+    params = [timeframe]
+    if pattern:
+        sql += " AND pattern = ?"
+        params.append(pattern)
+    sql += " ORDER BY date DESC LIMIT 1 OFFSET ?"
+    found = conn.execute(sql, params + [n - 1]).fetchone()
+    return found[0] if found else None
+
+
+def query(conn, timeframe="daily", pattern=None, kind=None, symbol=None,
+          since=None, until=None, sessions=None):
+    """Stored signals as a frame: DATE, PATTERN, SYMBOL, TYPE, EXPIRY + row."""
+    where, params = ["timeframe = ?"], [timeframe]
+
+    if sessions:
+        start = session_start(conn, timeframe, sessions, pattern)
+        if start is not None:
+            since = max(as_text(since), start) if since else start
+
+    for col, value in (("pattern", pattern), ("type", kind), ("symbol", symbol)):
+        if value:
+            where.append(f"{col} = ?")
+            params.append(value)
+    if since:
+        where.append("date >= ?")
+        params.append(as_text(since))
+    if until:
+        where.append("date <= ?")
+        params.append(as_text(until))
+
+    found = conn.execute(
+        "SELECT date, pattern, symbol, type, expiry, row FROM signals "
+        f"WHERE {' AND '.join(where)} ORDER BY date, pattern, symbol, expiry",
+        params,
+    ).fetchall()
+
+    out = pd.DataFrame(
+        [(d, p, s, t, e) for d, p, s, t, e, _ in found], columns=list(KEY_COLS)
+    )
+    extra = pd.DataFrame([json.loads(r[-1]) for r in found], index=out.index)
+    return pd.concat([out, extra], axis=1)
+
+
+def hit_counts(signals, min_hits=1):
+    # Signals per symbol (per pattern), most hits first
+    if signals.empty:
+        return pd.DataFrame(columns=["PATTERN", "SYMBOL", "HITS", "FIRST", "LAST"])
+    out = (
+        signals.groupby(["PATTERN", "SYMBOL"])["DATE"]
+               .agg(HITS="size", FIRST="min", LAST="max")
+               .reset_index()
+    )
+    out = out[out["HITS"] >= min_hits]
+    return out.sort_values(["HITS", "PATTERN", "SYMBOL"], ascending=[False, True, True])
+
+# ==================================================
+# MAIN
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the scan results history")
+    parser.add_argument("--db", default=str(RESULTS_DB))
+    parser.add_argument("--timeframe", default="daily")
+    parser.add_argument("--pattern")
+    parser.add_argument("--type", help="signal kind, e.g. BULLISH / MORNING_STAR")
+    parser.add_argument("--symbol")
+    parser.add_argument("--since", help="first date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="last date (YYYY-MM-DD)")
+    parser.add_argument("--sessions", type=int, help="only the last N sessions scanned")
+    parser.add_argument(
+        "--min-hits", type=int, help="symbols with at least N signals (counts table)"
+    )
+    parser.add_argument("--out", help="write the result as CSV")
+    args = parser.parse_args(argv)
+
+    if not Path(args.db).exists():
+        print(f"❌ No results history at {args.db}")
+        return
+
+    conn = connect(args.db)
+    out = query(
+        conn, args.timeframe, args.pattern, args.type, args.symbol,
+        args.since, args.until, args.sessions,
+    )
+    if args.min_hits:
+        out = hit_counts(out, args.min_hits)
+
+    if args.out:
+        out.to_csv(args.out, index=False)
+        print(f"📁 Output: {args.out}")
+    elif out.empty:
+        print("ℹ️ No stored signals match")
+    else:
+        print(out.to_string(index=False))
+
+    print(f"✅ Rows: {len(out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Single-pass multi-pattern scanner (EOD)
+
+✔ Each symbol file is read once
+✔ All selected patterns run on the in-memory frame
+✔ Same per-pattern report CSVs as the individual scanners
+✔ Daily patterns read only the last bars of each file
+✔ --store reads the columnar store (python -m engine.store)
+✔ --workers N loads symbol chunks on a process pool
+✔ Symbols stream through in chunks under --max-memory (engine.pipeline);
+   each chunk's matches go straight to the report CSVs + results history
+✔ Next files read on threads while one is parsed (--prefetch N)
+✔ --timeframe weekly|monthly scans the aggregated candle files
+   → reports/<timeframe>/..._<timeframe>.csv
+✔ --candles N runs the green-streak patterns over any N candles
+✔ Signals appended to the results history (engine.results)
+"""
+
+import argparse
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    MASTER_DIR, FUTURE_DIR, REPORTS_DIR, STORE_MASTER_DIR, STORE_FUTURE_DIR,
+    WEEKLY_DIR, MONTHLY_DIR,
+)
+from engine.expiry_index import expiry_contracts
+from engine.io import memory_report, read_candles, read_symbol, use_profile
+from engine.kernels import build_panel
+from engine.metrics import add_profile_arg, stage, start_profile
+from engine.pipeline import MAX_MEMORY_MB, Budget, CountingReader, CsvSink, stream
+from engine.prefetch import add_prefetch_arg, prefetch, use_prefetch
+from engine.patterns import (
+    CANDLE_COUNT, EXPIRY_RANKS, MASTER, MASTER_FUTURE, OHLC_EXPIRY,
+    columns_for, has_cols, pattern_name, patterns_for, whole, with_candles,
+)
+from engine.results import connect, record_staged, stage_signals
+
+SOURCE_DIRS = {
+    MASTER: MASTER_DIR,
+    MASTER_FUTURE: FUTURE_DIR,
+}
+
+STORE_DIRS = {
+    MASTER: STORE_MASTER_DIR,
+    MASTER_FUTURE: STORE_FUTURE_DIR,
+}
+
+# Aggregated candles exist for master only
+TIMEFRAME_DIRS = {
+    "weekly": {MASTER: WEEKLY_DIR},
+    "monthly": {MASTER: MONTHLY_DIR},
+}
+TIMEFRAMES = ("daily",) + tuple(TIMEFRAME_DIRS)
+
+# ==================================================
+# SCAN
+# ==================================================
+def detect(pattern, series, signals=None):
+    # series: [(symbol, key, tail)] → report rows, in series order
+    # signals: optional list, gets (symbol, date, kind, key, row) per row
+    frames = [tail for _, _, tail in series]
+    panel = build_panel(frames, pattern.panel_columns, pattern.depth, pattern.columns)
+    masks = pattern.kernel(panel)
+
+    kinds = list(masks)
+    hits = sorted(
+        (i, n)
+        for n, mask in enumerate(masks.values())
+        for i in np.flatnonzero(mask[:, -1])
+    )
+
+    rows = []
+    for i, n in hits:
+        symbol, key, tail = series[i]
+        try:
+            row = pattern.emit(tail, symbol, kinds[n], key)
+        except Exception as e:
+            print(f"⚠️ {pattern.name}: skipped {symbol}: {e}")
+            continue
+
+        rows.append(row)
+        if signals is not None:
+            signals.append((symbol, tail["DATE"].iloc[-1], kinds[n], key, row))
+
+    return rows
+
+
+def session_date(series):
+    # Trading day a scan ran on: latest bar over all series
+    dates = [tail["DATE"].iloc[-1] for _, _, tail in series if len(tail)]
+    return max(dates) if dates else None
+
+
+def select_series(select, n, frames, skipped):
+    # Per-symbol selection → [(symbol, key, last n bars)]
+    out = []
+    for symbol, df in frames:
+        try:
+            for key, sub in select(df):
+                out.append((symbol, key, sub.tail(n).copy()))
+        except Exception as e:
+            skipped.append(f"⚠️ {select.__name__}: skipped {symbol}: {e}")
+    return out
+
+
+def ranked_series(select, n, frames, skipped):
+    # Expiry selections: the whole shard ranked in one pass
+    futures = [(symbol, df) for symbol, df in frames if has_cols(df, OHLC_EXPIRY)]
+    try:
+        contracts = expiry_contracts(
+            [df for _, df in futures], EXPIRY_RANKS[select], n
+        )
+    except Exception:
+        # One bad file → fall back to symbol by symbol (and name it)
+        return select_series(select, n, frames, skipped)
+    return [(futures[i][0], expiry, sub) for i, expiry, sub in contracts]
+
+
+def load_series(paths, columns, depth, tail, reader=read_symbol):
+    # One chunk of files → ({select: [(symbol, key, tail)]}, skip messages)
+    frames, skipped = [], []
+
+    read = partial(reader, columns=columns, tail=tail)
+    for path, load in prefetch(paths, read):
+        symbol = path.stem
+
+        try:
+            frames.append((symbol, load()))
+        except Exception as e:
+            skipped.append(f"⚠️ Skipped {symbol}: {e}")
+
+    series = {}
+    for select, n in depth.items():
+        pick = ranked_series if select in EXPIRY_RANKS else select_series
+        with stage(f"select:{select.__name__}") as rec:
+            series[select] = pick(select, n, frames, skipped)
+            rec["rows"] = len(series[select])
+
+    return series, skipped
+
+
+def plan(group):
+    # (columns, {select: bars kept}, tail rows to read) for one source's patterns
+    columns = columns_for(group)
+
+    # One bar series list per selection, deep enough for every pattern
+    depth = {}
+    for p in group:
+        depth[p.select] = max(depth.get(p.select, 0), p.depth)
+
+    # Whole-series patterns only need the last bars of each file
+    tail = depth[whole] if set(depth) == {whole} else None
+    return columns, depth, tail
+
+
+def scan(patterns, source_dirs=SOURCE_DIRS, suffix=".csv", workers=1,
+         reader=read_symbol, reports=None, signals=None, max_memory=MAX_MEMORY_MB):
+    # {pattern name: rows found} for the patterns whose source is in source_dirs
+    # reports: optional {pattern name: Report}, gets each chunk's rows
+    # signals: optional Signals, stages each chunk's signals
+    # Symbols stream through in chunks of at most max_memory MB loaded
+    found = {}
+
+    for source, data_dir in source_dirs.items():
+        group = [p for p in patterns if p.source == source]
+        if not group:
+            continue
+
+        columns, depth, tail = plan(group)
+        for p in group:
+            found[p.name] = 0
+
+        files = sorted(data_dir.glob(f"*{suffix}"))
+        print(f"🔍 Scanning {len(files)} symbols ({source})...")
+
+        budget = Budget(max_memory, workers)
+        for series, skipped in stream(
+            load_series, files, budget, columns, depth, tail, CountingReader(reader)
+        ):
+            for msg in skipped:
+                print(msg)
+
+            for p in group:
+                hits = None if signals is None else []
+                with stage(f"detect:{p.name}", rows=len(series[p.select])):
+                    rows = detect(p, series[p.select], hits)
+                found[p.name] += len(rows)
+                if reports is not None:
+                    reports[p.name].write(rows)
+                if signals is not None:
+                    signals.add(p.name, session_date(series[p.select]), hits)
+
+    return found
+
+# ==================================================
+# SAVE
+# ==================================================
+def to_frame(pattern, rows):
+    out_df = pd.DataFrame(rows)
+    if pattern.sort_by is not None:
+        out_df = out_df.sort_values(pattern.sort_by, ascending=pattern.ascending)
+    return out_df
+
+
+class Report:
+    """
+    One pattern's report CSV(s), written chunk by chunk through CsvSink
+    (sorted as to_frame sorts; split_by → one file per key).
+    """
+
+    def __init__(self, pattern, out_dir=REPORTS_DIR, timeframe="daily"):
+        self.pattern = pattern
+        self.out_dir = out_dir
+        self.timeframe = timeframe
+        self.sinks = {}
+
+    def write(self, rows):
+        p = self.pattern
+        if p.split_by is None:
+            groups = {None: rows} if rows else {}
+        else:
+            groups = {}
+            for row in rows:
+                row = dict(row)
+                groups.setdefault(row.pop(p.split_by), []).append(row)
+
+        for key, group in groups.items():
+            sink = self.sinks.get(key)
+            if sink is None:
+                # out_file: {} = split key, {timeframe} = bars scanned
+                out_file = self.out_dir / p.out_file.format(key, timeframe=self.timeframe)
+                sink = self.sinks[key] = CsvSink(out_file, None, p.sort_by, p.ascending)
+            with stage("write", rows=len(group)):
+                sink.write(pd.DataFrame(group))
+
+    def close(self):
+        if not self.sinks:
+            print(f"ℹ️ No {self.pattern.label} found today")
+            return
+
+        for sink in self.sinks.values():
+            with stage("write"):
+                rows = sink.close()
+            print(f"✅ {self.pattern.label} found: {rows}")
+            print(f"📁 Output: {sink.path}")
+
+    def discard(self):
+        for sink in self.sinks.values():
+            sink.discard()
+
+
+class Signals:
+    """Signals staged in the results history chunk by chunk (engine.results)."""
+
+    def __init__(self, conn, timeframe):
+        self.conn = conn
+        self.timeframe = timeframe
+        self.sessions = {}
+
+    def add(self, name, session, hits):
+        # session: latest bar of the chunk; the pattern's session is the max
+        stage_signals(self.conn, self.timeframe, name, hits)
+        dates = [d for d in (self.sessions.get(name), session) if d is not None]
+        self.sessions[name] = max(dates) if dates else None
+
+    def record(self):
+        return sum(
+            record_staged(self.conn, self.timeframe, name, session)
+            for name, session in self.sessions.items()
+        )
+
+# ==================================================
+# MAIN
+# ==================================================
+def main(names=None, argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    if names is None:
+        parser.add_argument(
+            "--patterns", nargs="+", type=pattern_name, metavar="PATTERN",
+            help="patterns to run (default: all)",
+        )
+    parser.add_argument(
+        "--store", action="store_true", help="read the columnar store instead of CSV"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="processes loading symbol files"
+    )
+    parser.add_argument(
+        "--timeframe", choices=TIMEFRAMES, default="daily",
+        help="bars to scan (weekly / monthly: candle files, master only)",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="float32 / int32 / categorical load profile (engine.io)",
+    )
+    parser.add_argument(
+        "--no-record", action="store_true",
+        help="skip appending signals to the results history",
+    )
+    parser.add_argument(
+        "--candles", type=int, metavar="N",
+        help=f"green-streak patterns over N candles (default {CANDLE_COUNT})",
+    )
+    parser.add_argument(
+        "--max-memory", type=float, default=MAX_MEMORY_MB, metavar="MB",
+        help="soft ceiling on symbol frames loaded at once: chunks are sized "
+             "from a guessed bytes ratio until one is measured, and a file "
+             "larger than the limit still loads whole (engine.pipeline)",
+    )
+    add_prefetch_arg(parser)
+    add_profile_arg(parser)
+    args = parser.parse_args(argv)
+    start_profile(args.profile)
+
+    if args.compact:
+        use_profile("compact")
+    if args.prefetch is not None:
+        use_prefetch(args.prefetch)
+
+    if names is None:
+        names = args.patterns
+    if args.candles:
+        names = with_candles(names, args.candles)
+
+    patterns = patterns_for(names)
+    dirs, suffix, reader = SOURCE_DIRS, ".csv", read_symbol
+    out_dir = REPORTS_DIR
+    if args.timeframe != "daily":
+        if args.store:
+            parser.error("--store holds daily bars; drop it for --timeframe")
+        dirs, reader = TIMEFRAME_DIRS[args.timeframe], read_candles
+        out_dir = REPORTS_DIR / args.timeframe
+    elif args.store:
+        dirs, suffix = STORE_DIRS, ".parquet"
+
+    reports = {p.name: Report(p, out_dir, args.timeframe) for p in patterns}
+    signals = None if args.no_record else Signals(connect(), args.timeframe)
+    try:
+        found = scan(
+            patterns, dirs, suffix, args.workers, reader,
+            reports, signals, args.max_memory,
+        )
+    except BaseException:
+        for r in reports.values():
+            r.discard()
+        raise
+
+    report = memory_report()
+    if report:
+        print(report)
+
+    for p in patterns:
+        if p.name not in found:
+            print(f"ℹ️ {p.label}: no {args.timeframe} candles for {p.source}")
+            continue
+        reports[p.name].close()
+
+    if signals is not None:
+        with stage("record"):
+            stored = signals.record()
+            signals.conn.close()
+        if signals.sessions:
+            print(f"🗄️ Results history: {stored} signals recorded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Sort-order metadata of master / master_future files
+
+✔ Per file: DATE non-decreasing ("sorted") and DATE / (DATE, EXPIRY)
+   unique, recorded in <data dir>/_sorted.json
+✔ An entry holds only while the file's mtime + size match
+✔ Written by engine.ingest as it appends, or by this verify pass
+✔ Readers (engine.io) skip sort_values + copy for files flagged sorted;
+   without a valid entry they check DATE monotonicity first (O(n))
+
+Usage:
+    python -m engine.sortmeta          # verify files without a valid entry
+    python -m engine.sortmeta --full   # re-verify everything
+"""
+
+import argparse
+import json
+import os
+
+from config import FUTURE_DIR, MASTER_DIR
+
+META_FILE = "_sorted.json"
+
+# Per process: data dir → (meta file mtime, entries)
+_cache = {}
+
+# ==================================================
+# META
+# ==================================================
+def load_meta(data_dir):
+    meta_file = data_dir / META_FILE
+    if not meta_file.exists():
+        return {}
+    return json.loads(meta_file.read_text())
+
+
+def save_meta(data_dir, meta):
+    # Write + rename: readers never see a half-written file
+    tmp = data_dir / f"{META_FILE}.tmp"
+    tmp.write_text(json.dumps(meta, indent=1, sort_keys=True))
+    os.replace(tmp, data_dir / META_FILE)
+
+
+def cached_meta(data_dir):
+    meta_file = data_dir / META_FILE
+    try:
+        mtime = meta_file.stat().st_mtime
+    except OSError:
+        return {}
+
+    cached = _cache.get(data_dir)
+    if cached is None or cached[0] != mtime:
+        cached = _cache[data_dir] = (mtime, load_meta(data_dir))
+    return cached[1]
+
+
+def stamp(path):
+    st = path.stat()
+    return {"mtime": st.st_mtime, "size": st.st_size}
+
+
+def valid_entry(path, meta=None):
+    # Entry of a file that has not changed since it was recorded (else None)
+    if meta is None:
+        meta = cached_meta(path.parent)
+    entry = meta.get(path.stem)
+    if entry is None:
+        return None
+    try:
+        current = stamp(path)
+    except OSError:
+        return None
+    if entry["mtime"] != current["mtime"] or entry["size"] != current["size"]:
+        return None
+    return entry
+
+
+def presorted(path):
+    entry = valid_entry(path)
+    return entry is not None and entry["sorted"]
+
+# ==================================================
+# CHECK
+# ==================================================
+def order_flags(df):
+    # df: parsed DATE (+ EXPIRY) columns in file order
+    keys = ["DATE", "EXPIRY"] if "EXPIRY" in df.columns else ["DATE"]
+    return {
+        "sorted": bool(df["DATE"].is_monotonic_increasing),
+        "unique": not bool(df.duplicated(keys).any()),
+    }
+
+
+def make_entry(path, flags):
+    return {**stamp(path), **flags}
+
+
+def verify_file(path):
+    from engine.io import parse_csv
+    return make_entry(path, order_flags(parse_csv(path, ["DATE", "EXPIRY"])))
+
+
+def verify_dir(data_dir, full=False):
+    meta = {} if full else load_meta(data_dir)
+    files = sorted(data_dir.glob("*.csv"))
+
+    checked, unsorted = 0, []
+    for path in files:
+        if not full and valid_entry(path, meta) is not None:
+            continue
+        try:
+            meta[path.stem] = verify_file(path)
+        except Exception as e:
+            print(f"⚠️ Skipped {path.name}: {e}")
+            continue
+        checked += 1
+        if not meta[path.stem]["sorted"]:
+            unsorted.append(path.stem)
+
+    live = {p.stem for p in files}
+    for symbol in set(meta) - live:
+        meta.pop(symbol)
+
+    save_meta(data_dir, meta)
+    print(f"✅ {data_dir.name}: {checked} verified, {len(files) - checked} up to date")
+    if unsorted:
+        print(f"⚠️ Not DATE-sorted (readers sort these): {', '.join(unsorted)}")
+
+# ==================================================
+# MAIN
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record sort order of master files")
+    parser.add_argument("--full", action="store_true", help="re-verify every file")
+    args = parser.parse_args(argv)
+
+    for data_dir in (MASTER_DIR, FUTURE_DIR):
+        if data_dir.exists():
+            verify_dir(data_dir, args.full)
+
+
+if __name__ == "__main__":
+    main()
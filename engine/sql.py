@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Embedded SQL over master / master_future
+
+✔ Local SQLite copy of every symbol's bars (SQL_DB), one table per source
+✔ Re-sync reloads only symbols whose source file changed
+✔ Indexed on (SYMBOL, DATE) and DATE → cross-sectional screens
+   filter inside SQLite, not in pandas loops
+✔ Pattern metrics as views: RANGE, BODY_%, UPPER_WICK_%, LOWER_WICK_%,
+   GREEN, EXPIRY_RANK (futures: 1 = nearest expiry trading that day)
+✔ Same metrics as functions for any table: body_pct(o, h, l, c),
+   upper_wick_pct, lower_wick_pct, is_green(o, c)
+✔ Results history (engine.results) attached as results.signals
+
+Usage:
+    python -m engine.sql "SELECT SYMBOL, \\"UPPER_WICK_%\\" FROM master_latest
+                          WHERE \\"BODY_%\\" < 5 ORDER BY 2 DESC"
+    python -m engine.sql --file screen.sql --out screen.csv
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from config import RESULTS_DB, SQL_DB
+from engine.io import read_symbol
+from engine.parallel import run_sharded
+from engine.patterns import MASTER, MASTER_FUTURE
+from engine.scan import SOURCE_DIRS, STORE_DIRS
+
+# source → table columns (all optional in the files except SYMBOL / DATE)
+TABLES = {
+    MASTER: ("SYMBOL", "DATE", "OPEN", "HIGH", "LOW", "CLOSE", "TOTTRDQTY"),
+    MASTER_FUTURE: (
+        "SYMBOL", "DATE", "EXPIRY", "OPEN", "HIGH", "LOW", "CLOSE", "TOTTRDQTY"
+    ),
+}
+
+TYPES = {"SYMBOL": "TEXT", "DATE": "TEXT", "EXPIRY": "TEXT", "TOTTRDQTY": "INTEGER"}
+
+METRICS = """
+    HIGH - LOW AS RANGE,
+    ABS(OPEN - CLOSE) AS BODY,
+    CASE WHEN HIGH > LOW THEN ABS(OPEN - CLOSE) / (HIGH - LOW) * 100 END AS "BODY_%",
+    CASE WHEN HIGH > LOW THEN (HIGH - MAX(OPEN, CLOSE)) / (HIGH - LOW) * 100 END
+        AS "UPPER_WICK_%",
+    CASE WHEN HIGH > LOW THEN (MIN(OPEN, CLOSE) - LOW) / (HIGH - LOW) * 100 END
+        AS "LOWER_WICK_%",
+    CLOSE > OPEN AS GREEN"""
+
+VIEWS = f"""
+CREATE TEMP VIEW master_metrics AS
+SELECT *, {METRICS}
+FROM master;
+
+-- Each symbol's own last bar (as the scanners read it), via (SYMBOL, DATE)
+CREATE TEMP VIEW master_latest AS
+SELECT * FROM master_metrics AS m
+WHERE DATE = (SELECT MAX(DATE) FROM master WHERE SYMBOL = m.SYMBOL);
+
+CREATE TEMP VIEW future_metrics AS
+SELECT *, {METRICS},
+    DENSE_RANK() OVER (PARTITION BY SYMBOL, DATE ORDER BY EXPIRY) AS EXPIRY_RANK
+FROM master_future;
+
+CREATE TEMP VIEW future_latest AS
+SELECT * FROM future_metrics AS f
+WHERE DATE = (SELECT MAX(DATE) FROM master_future WHERE SYMBOL = f.SYMBOL);
+"""
+
+# ==================================================
+# FUNCTIONS
+# ==================================================
+def ratio(part, o, h, l, c):
+    if None in (o, h, l, c) or h <= l:
+        return None
+    return part / (h - l) * 100
+
+
+def body_pct(o, h, l, c):
+    return ratio(abs(o - c), o, h, l, c) if None not in (o, c) else None
+
+
+def upper_wick_pct(o, h, l, c):
+    return ratio(h - max(o, c), o, h, l, c) if None not in (o, h, c) else None
+
+
+def lower_wick_pct(o, h, l, c):
+    return ratio(min(o, c) - l, o, h, l, c) if None not in (o, l, c) else None
+
+
+def is_green(o, c):
+    return None if None in (o, c) else int(c > o)
+
+
+FUNCTIONS = {
+    "body_pct": (body_pct, 4),
+    "upper_wick_pct": (upper_wick_pct, 4),
+    "lower_wick_pct": (lower_wick_pct, 4),
+    "is_green": (is_green, 2),
+}
+
+# ==================================================
+# CONNECT
+# ==================================================
+def create_tables(conn):
+    for source, cols in TABLES.items():
+        decl = ", ".join(f"{c} {TYPES.get(c, 'REAL')}" for c in cols)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {source} ({decl})")
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {source}_symbol ON {source} (SYMBOL, DATE)"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {source}_date ON {source} (DATE)")
+
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS _files ("
+        "source TEXT, symbol TEXT, path TEXT, mtime REAL, rows INTEGER, "
+        "PRIMARY KEY (source, symbol))"
+    )
+
+
+def connect(path=SQL_DB):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    create_tables(conn)
+    conn.executescript(VIEWS)
+
+    for name, (func, n) in FUNCTIONS.items():
+        conn.create_function(name, n, func, deterministic=True)
+
+    if RESULTS_DB.exists():
+        conn.execute("ATTACH DATABASE ? AS results", (str(RESULTS_DB),))
+    return conn
+
+# ==================================================
+# SYNC
+# ==================================================
+def load_rows(paths, cols):
+    # One shard of files → [(symbol, path, mtime, rows)], skip messages
+    loaded, skipped = [], []
+    for path in paths:
+        symbol = path.stem
+        try:
+            mtime = path.stat().st_mtime
+            df = read_symbol(path, [c for c in cols if c != "SYMBOL"])
+        except Exception as e:
+            skipped.append(f"⚠️ Skipped {symbol}: {e}")
+            continue
+
+        values = []
+        for col in cols:
+            if col == "SYMBOL":
+                values.append([symbol] * len(df))
+            elif col not in df.columns:
+                values.append([None] * len(df))
+            elif col in ("DATE", "EXPIRY"):
+                values.append(df[col].dt.strftime("%Y-%m-%d").tolist())
+            else:
+                values.append(df[col].tolist())
+
+        loaded.append((symbol, str(path), mtime, list(zip(*values))))
+    return loaded, skipped
+
+
+def sync(conn, source_dirs=SOURCE_DIRS, suffix=".csv", workers=1):
+    """Reload changed / new symbols, drop removed ones. Returns symbols loaded."""
+    total = 0
+
+    for source, data_dir in source_dirs.items():
+        cols = TABLES[source]
+        files = {p.stem: p for p in sorted(data_dir.glob(f"*{suffix}"))}
+        known = {
+            symbol: (path, mtime) for symbol, path, mtime in conn.execute(
+                "SELECT symbol, path, mtime FROM _files WHERE source = ?", (source,)
+            )
+        }
+
+        gone = [s for s in known if s not in files]
+        changed = [
+            path for symbol, path in files.items()
+            if known.get(symbol) != (str(path), path.stat().st_mtime)
+        ]
+
+        with conn:
+            for symbol in gone:
+                conn.execute(f"DELETE FROM {source} WHERE SYMBOL = ?", (symbol,))
+                conn.execute(
+                    "DELETE FROM _files WHERE source = ? AND symbol = ?", (source, symbol)
+                )
+
+        if not changed:
+            continue
+        print(f"🔄 Syncing {len(changed)} symbols ({source})...")
+
+        marks = ", ".join("?" * len(cols))
+        for loaded, skipped in run_sharded(load_rows, changed, workers, cols):
+            for msg in skipped:
+                print(msg)
+            with conn:
+                for symbol, path, mtime, rows in loaded:
+                    conn.execute(f"DELETE FROM {source} WHERE SYMBOL = ?", (symbol,))
+                    conn.executemany(f"INSERT INTO {source} VALUES ({marks})", rows)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO _files VALUES (?, ?, ?, ?, ?)",
+                        (source, symbol, path, mtime, len(rows)),
+                    )
+            total += len(loaded)
+
+    return total
+
+
+def run_query(conn, sql, params=()):
+    return pd.read_sql_query(sql, conn, params=params)
+
+# ==================================================
+# MAIN
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQL over master / master_future")
+    parser.add_argument("sql", nargs="?", help="query to run")
+    parser.add_argument("--file", help="read the query from a file")
+    parser.add_argument("--db", default=str(SQL_DB))
+    parser.add_argument("--store", action="store_true", help="sync from the columnar store")
+    parser.add_argument("--no-sync", action="store_true", help="query the copy as it is")
+    parser.add_argument("--workers", type=int, default=1, help="processes reading files")
+    parser.add_argument("--out", help="write the result as CSV")
+    args = parser.parse_args(argv)
+
+    sql = Path(args.file).read_text() if args.file else args.sql
+
+    conn = connect(args.db)
+    if not args.no_sync:
+        if args.store:
+            loaded = sync(conn, STORE_DIRS, ".parquet", args.workers)
+        else:
+            loaded = sync(conn, workers=args.workers)
+        print(f"✅ SQL copy up to date ({loaded} symbols reloaded)")
+
+    if not sql:
+        return
+
+    start = time.perf_counter()
+    out = run_query(conn, sql)
+    elapsed = time.perf_counter() - start
+
+    if args.out:
+        out.to_csv(args.out, index=False)
+        print(f"📁 Output: {args.out}")
+    elif out.empty:
+        print("ℹ️ No rows")
+    else:
+        print(out.to_string(index=False))
+
+    print(f"✅ Rows: {len(out)} ({elapsed * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Columnar master store
+
+✔ master / master_future CSV → one Parquet file per symbol
+✔ Normalized column names, DATE / EXPIRY stored as datetime64
+✔ Rows stored DATE-sorted (readers never re-sort)
+✔ Column projection + tail reads (last row groups only)
+✔ master_future: per-symbol expiry index (engine.expiry_index)
+✔ Re-run converts only CSVs changed since the last build
+
+Usage:
+    python -m engine.store            # build / refresh both stores
+    python -m engine.store --full     # rebuild everything
+"""
+
+import argparse
+import json
+
+import pyarrow.parquet as pq
+
+from config import (
+    MASTER_DIR, FUTURE_DIR, STORE_MASTER_DIR, STORE_FUTURE_DIR,
+    STORE_FUTURE_INDEX_DIR,
+)
+from engine.expiry_index import build_index, index_path, load_index
+from engine.io import read_master
+
+META_FILE = "_meta.json"
+
+# Small row groups let tail reads skip most of a symbol's history
+ROW_GROUP_ROWS = 1024
+
+# name → (CSV dir, store dir, expiry index dir)
+STORES = {
+    "master": (MASTER_DIR, STORE_MASTER_DIR, None),
+    "master_future": (FUTURE_DIR, STORE_FUTURE_DIR, STORE_FUTURE_INDEX_DIR),
+}
+
+# ==================================================
+# META
+# ==================================================
+def load_meta(store_dir):
+    meta_file = store_dir / META_FILE
+    if not meta_file.exists():
+        return {}
+    return json.loads(meta_file.read_text())
+
+
+def save_meta(store_dir, meta):
+    (store_dir / META_FILE).write_text(json.dumps(meta, indent=1, sort_keys=True))
+
+# ==================================================
+# READ
+# ==================================================
+def read_store(path, columns=None, tail=None):
+    pf = pq.ParquetFile(path)
+
+    if columns is not None:
+        columns = [c for c in pf.schema_arrow.names if c in set(columns)]
+
+    if tail is None:
+        df = pf.read(columns=columns).to_pandas()
+        if "EXPIRY" in df:
+            index = load_index(path.stem, len(df))
+            if index is not None:
+                df.attrs["expiry_index"] = index
+        return df
+
+    # Only the trailing row groups that cover the last `tail` rows
+    groups, rows = [], 0
+    for i in reversed(range(pf.num_row_groups)):
+        groups.insert(0, i)
+        rows += pf.metadata.row_group(i).num_rows
+        if rows >= tail:
+            break
+
+    df = pf.read_row_groups(groups, columns=columns).to_pandas()
+    return df.tail(tail).reset_index(drop=True)
+
+# ==================================================
+# BUILD
+# ==================================================
+def convert(csv_file, out_file, index_dir=None):
+    df = read_master(csv_file)
+    df.to_parquet(out_file, index=False, row_group_size=ROW_GROUP_ROWS)
+
+    if index_dir is not None and "EXPIRY" in df:
+        build_index(df).save(index_path(out_file.stem, index_dir))
+    return df
+
+
+def build_store(src_dir, store_dir, index_dir=None, full=False):
+    store_dir.mkdir(parents=True, exist_ok=True)
+    meta = {} if full else load_meta(store_dir)
+
+    files = sorted(src_dir.glob("*.csv"))
+    print(f"Converting {len(files)} symbols → {store_dir}\n")
+
+    converted = 0
+    for csv_file in files:
+        symbol = csv_file.stem
+        out_file = store_dir / f"{symbol}.parquet"
+        mtime = csv_file.stat().st_mtime
+
+        entry = meta.get(symbol)
+        if (
+            entry and entry["source_mtime"] == mtime and out_file.exists() and
+            (index_dir is None or index_path(symbol, index_dir).exists())
+        ):
+            continue
+
+        try:
+            df = convert(csv_file, out_file, index_dir)
+        except Exception as e:
+            print(f"⚠️ Skipped {symbol}: {e}")
+            continue
+
+        meta[symbol] = {
+            "source_mtime": mtime,
+            "rows": len(df),
+            "last_date": str(df["DATE"].max().date()) if "DATE" in df else None,
+        }
+        converted += 1
+
+    # Drop symbols whose CSV is gone
+    live = {f.stem for f in files}
+    for symbol in set(meta) - live:
+        meta.pop(symbol)
+        (store_dir / f"{symbol}.parquet").unlink(missing_ok=True)
+        if index_dir is not None:
+            index_path(symbol, index_dir).unlink(missing_ok=True)
+
+    save_meta(store_dir, meta)
+    print(f"✅ {converted} converted, {len(files) - converted} up to date")
+
+# ==================================================
+# MAIN
+# ==================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the columnar master store")
+    parser.add_argument("--full", action="store_true", help="rebuild every symbol")
+    parser.add_argument(
+        "--only", choices=sorted(STORES), help="build just one of the stores"
+    )
+    args = parser.parse_args(argv)
+
+    for name, (src_dir, store_dir, index_dir) in STORES.items():
+        if args.only and name != args.only:
+            continue
+        build_store(src_dir, store_dir, index_dir, full=args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Exchange trading calendar
+
+✔ Trading days = weekdays minus the holidays in HOLIDAYS_FILE (if present)
+✔ Week  = Wednesday → Tuesday, month = first Wednesday → next first Wednesday
+✔ A bucket opens on the first trading day on / after its Wednesday
+   → a holiday Wednesday no longer merges two buckets
+✔ Bucket ids precomputed for every trading day; a symbol's dates map to
+   buckets with one searchsorted
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import HOLIDAYS_FILE
+
+CALENDAR_START = "1990-01-01"
+CALENDAR_YEARS_AHEAD = 2
+
+WEEK = "week"
+MONTH = "month"
+
+# ==================================================
+# HOLIDAYS
+# ==================================================
+def read_dates(path):
+    # First column of a CSV / plain list; header and unparsable lines ignored
+    raw = pd.read_csv(path, header=None, usecols=[0], skip_blank_lines=True)[0]
+    dates = pd.to_datetime(raw.astype(str).str.strip(), errors="coerce", format="mixed")
+    return np.unique(dates.dropna().to_numpy().astype("datetime64[D]"))
+
+
+def load_holidays(path=HOLIDAYS_FILE):
+    if not path.exists():
+        return np.array([], dtype="datetime64[D]")
+    return read_dates(path)
+
+# ==================================================
+# CALENDAR
+# ==================================================
+def first_wednesdays(start, end):
+    months = pd.date_range(start, end, freq="MS")
+    return months + pd.to_timedelta((2 - months.weekday) % 7, unit="D")
+
+
+class TradingCalendar:
+    """
+    days          trading days (datetime64[D])
+    starts[freq]  first trading day of every bucket
+    ids[freq]     bucket id of every trading day
+    """
+
+    def __init__(self, holidays=None, start=CALENDAR_START, end=None):
+        if end is None:
+            end = pd.Timestamp.today().normalize() + pd.DateOffset(years=CALENDAR_YEARS_AHEAD)
+        if holidays is None:
+            holidays = load_holidays()
+
+        weekdays = pd.bdate_range(start, end).to_numpy().astype("datetime64[D]")
+        self.days = weekdays[~np.isin(weekdays, holidays)]
+
+        anchors = {
+            WEEK: pd.date_range(start, end, freq="W-WED"),
+            MONTH: first_wednesdays(start, end),
+        }
+
+        self.starts, self.ids = {}, {}
+        for freq, dates in anchors.items():
+            opens = np.searchsorted(self.days, dates.to_numpy().astype("datetime64[D]"))
+            opens = np.unique(np.concatenate([[0], opens[opens < len(self.days)]]))
+            self.starts[freq] = self.days[opens]
+            self.ids[freq] = np.searchsorted(opens, np.arange(len(self.days)), "right") - 1
+
+    def buckets(self, dates, freq):
+        # Bucket id per date; trading-day dates and off-calendar sessions alike
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        return np.searchsorted(self.starts[freq], dates, "right") - 1
+
+    def bucket_days(self, bucket, freq):
+        # Trading days of one bucket
+        return self.days[self.ids[freq] == bucket]
+
+
+_calendar = None
+
+
+def trading_calendar():
+    # One calendar per process
+    global _calendar
+    if _calendar is None:
+        _calendar = TradingCalendar()
+    return _calendar
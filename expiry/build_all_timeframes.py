@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine
+Build WEEKLY + MONTHLY (+ custom-anchored) candles in one pass
+
+✔ Each symbol's daily bars are read once for every timeframe
+✔ Same files as build_weekly_wed_tue / build_monthly_wed_tue (+ Volume)
+✔ --anchors FILE: extra candles ending on each listed date
+   (e.g. expiry → expiry), written to data/<name>_candle_data
+✔ Leaves state for the single-timeframe builders' --incremental
+✔ --prefetch N: next N symbol files read on threads while one builds
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config import MASTER_DIR, STORE_MASTER_DIR
+from engine.aggregate import TIMEFRAMES, all_candles, anchored
+from engine.incremental import fingerprint, make_entry, save_state, write_candles
+from engine.io import memory_report, read_daily, use_profile
+from engine.metrics import add_profile_arg, stage, start_profile
+from engine.parallel import run_sharded
+from engine.prefetch import add_prefetch_arg, prefetch, use_prefetch
+from engine.trading_calendar import read_dates
+
+# ================= MAIN =================
+def build_files(files, timeframes):
+    log, entries = [], {tf.name: {} for tf in timeframes}
+
+    for file, load in prefetch(files, read_daily):
+        symbol = file.stem
+
+        try:
+            df = load()
+        except Exception as e:
+            log.append(f"⚠️ Skipped {file.name}: {e}")
+            continue
+
+        required = {"date", "open", "high", "low", "close"}
+        if not required.issubset(df.columns) or df.empty:
+            log.append(f"❌ Skipping {file.name}")
+            continue
+
+        with stage("build", symbol):
+            built = all_candles(df, timeframes)
+            mark = fingerprint(file)
+            for tf in timeframes:
+                candles = built[tf.name]
+                offset = write_candles(tf.out_dir / f"{symbol}.csv", candles)
+                entries[tf.name][symbol] = make_entry(
+                    file, df, candles, tf.start_col, offset, mark
+                )
+
+        log.append(f"✓ {', '.join(tf.name for tf in timeframes)}: {file.name}")
+
+    return log, entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build all candle timeframes")
+    parser.add_argument(
+        "--timeframes", nargs="+", choices=sorted(TIMEFRAMES), default=sorted(TIMEFRAMES)
+    )
+    parser.add_argument("--anchors", help="date list; each date closes a custom candle")
+    parser.add_argument("--anchor-name", default="expiry", help="custom timeframe name")
+    parser.add_argument(
+        "--store", action="store_true", help="read the columnar store instead of CSV"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="processes building symbols"
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="float32 / int32 / categorical load profile (engine.io)",
+    )
+    add_prefetch_arg(parser)
+    add_profile_arg(parser)
+    args = parser.parse_args(argv)
+    start_profile(args.profile)
+
+    if args.compact:
+        use_profile("compact")
+    if args.prefetch is not None:
+        use_prefetch(args.prefetch)
+
+    timeframes = [TIMEFRAMES[name] for name in args.timeframes]
+    if args.anchors:
+        timeframes.append(anchored(args.anchor_name, read_dates(Path(args.anchors))))
+
+    if args.store:
+        files = sorted(STORE_MASTER_DIR.glob("*.parquet"))
+    else:
+        files = sorted(MASTER_DIR.glob("*.csv"))
+
+    for tf in timeframes:
+        tf.out_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Processing {len(files)} symbols...\n")
+
+    state = {tf.name: {} for tf in timeframes}
+    for log, entries in run_sharded(build_files, files, args.workers, timeframes):
+        for line in log:
+            print(line)
+        for name, part in entries.items():
+            state[name].update(part)
+
+    for tf in timeframes:
+        save_state(tf.out_dir, state[tf.name])
+
+    report = memory_report()
+    if report:
+        print(report)
+
+    print(f"\n✅ {' / '.join(tf.name.upper() for tf in timeframes)} CANDLES CREATED")
+
+if __name__ == "__main__":
+    main()
@@ -5,66 +5,122 @@
 ExpiryEngine
 Build MONTHLY candles
 Month = First Wednesday → Last Tuesday
+
+--incremental: only the open month is recomputed and re-appended
+   (state + daily file fingerprints kept by --incremental runs only)
+--prefetch N: next N symbol files read on threads while one builds
 """
 
-import pandas as pd
+import argparse
+import sys
 from pathlib import Path
 
-# ================= PATHS =================
-MASTER_DIR = Path(r"H:\ExpiryEngine\data\master")
-OUT_DIR = Path(r"H:\ExpiryEngine\data\monthly_candle_data")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config import MASTER_DIR, STORE_MASTER_DIR, MONTHLY_DIR as OUT_DIR
+from engine.aggregate import TIMEFRAMES, candles
+from engine.incremental import (
+    build_full, build_incremental, clear_state, load_state, save_state
+)
+from engine.io import memory_report, read_daily, use_profile
+from engine.metrics import add_profile_arg, start_profile
+from engine.parallel import run_sharded
+from engine.prefetch import add_prefetch_arg, prefetch, use_prefetch
 
 # ================= LOGIC =================
+# OHLC + Volume per trading-calendar bucket (engine.aggregate)
 def build_monthly(df):
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date")
+    return candles(df, TIMEFRAMES["monthly"])
 
-    # Monday=0 ... Wednesday=2
-    df["weekday"] = df["date"].dt.weekday
+# ================= MAIN =================
+def build_files(files, incremental):
+    state = load_state(OUT_DIR) if incremental else {}
+    log, entries = [], {}
+
+    # Incremental symbols read their own tail; the rest are read ahead
+    def read(file):
+        return None if file.stem in state else read_daily(file)
+
+    for file, load in prefetch(files, read):
+        symbol = file.stem
+        out_file = OUT_DIR / f"{symbol}.csv"
+
+        try:
+            if symbol in state:
+                entry, status = build_incremental(
+                    file, out_file, build_monthly, "Month_Start", state[symbol]
+                )
+                entries[symbol] = entry
+                log.append(f"✓ Monthly ({status}): {file.name}")
+                continue
+
+            df = load()
+            required = {"date", "open", "high", "low", "close"}
+            if not required.issubset(df.columns) or df.empty:
+                log.append(f"❌ Skipping {file.name}")
+                continue
+
+            entry = build_full(file, out_file, build_monthly, "Month_Start", df, incremental)
+        except Exception as e:
+            log.append(f"⚠️ Skipped {file.name}: {e}")
+            continue
 
-    # First Wednesday of month
-    df["is_first_wed"] = (
-        (df["weekday"] == 2) &
-        (df["date"].dt.day <= 7)
-    )
+        if incremental:
+            entries[symbol] = entry
+        log.append(f"✓ Monthly: {file.name}")
 
-    # New month group on first Wednesday
-    df["month_id"] = df["is_first_wed"].cumsum()
-
-    monthly = (
-        df.groupby("month_id")
-        .agg(
-            Month_Start=("date", "min"),
-            Month_End=("date", "max"),
-            Open=("open", "first"),
-            High=("high", "max"),
-            Low=("low", "min"),
-            Close=("close", "last"),
-        )
-        .reset_index(drop=True)
-    )
+    return log, entries
 
-    return monthly
 
-# ================= MAIN =================
-def main():
-    files = sorted(MASTER_DIR.glob("*.csv"))
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build monthly candles")
+    parser.add_argument(
+        "--store", action="store_true", help="read the columnar store instead of CSV"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="processes building symbols"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="update only the open monthly candle since the last run",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="float32 / int32 / categorical load profile (engine.io)",
+    )
+    add_prefetch_arg(parser)
+    add_profile_arg(parser)
+    args = parser.parse_args(argv)
+    start_profile(args.profile)
+
+    if args.compact:
+        use_profile("compact")
+    if args.prefetch is not None:
+        use_prefetch(args.prefetch)
+
+    if args.store:
+        files = sorted(STORE_MASTER_DIR.glob("*.parquet"))
+    else:
+        files = sorted(MASTER_DIR.glob("*.csv"))
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
     print(f"Processing {len(files)} symbols...\n")
 
-    for file in files:
-        df = pd.read_csv(file)
-
-        required = {"date", "open", "high", "low", "close"}
-        if not required.issubset(df.columns):
-            print(f"❌ Skipping {file.name}")
-            continue
-
-        monthly = build_monthly(df)
-        out_file = OUT_DIR / file.name
-        monthly.to_csv(out_file, index=False)
-
-        print(f"✓ Monthly: {file.name}")
+    state = {}
+    for log, entries in run_sharded(build_files, files, args.workers, args.incremental):
+        for line in log:
+            print(line)
+        state.update(entries)
+
+    # State (+ daily file fingerprints) only for --incremental runs
+    if args.incremental:
+        save_state(OUT_DIR, state)
+    else:
+        clear_state(OUT_DIR)
+
+    report = memory_report()
+    if report:
+        print(report)
 
     print("\n✅ MONTHLY EXPIRY CANDLES CREATED")
 
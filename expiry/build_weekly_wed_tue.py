@@ -4,60 +4,122 @@
 """
 ExpiryEngine
 Build WEEKLY candles (Wednesday → Tuesday)
+
+--incremental: only the open week is recomputed and re-appended
+   (state + daily file fingerprints kept by --incremental runs only)
+--prefetch N: next N symbol files read on threads while one builds
 """
 
-import pandas as pd
+import argparse
+import sys
 from pathlib import Path
 
-# ================= PATHS =================
-MASTER_DIR = Path(r"H:\ExpiryEngine\data\master")
-OUT_DIR = Path(r"H:\ExpiryEngine\data\weekly_candle_data")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config import MASTER_DIR, STORE_MASTER_DIR, WEEKLY_DIR as OUT_DIR
+from engine.aggregate import TIMEFRAMES, candles
+from engine.incremental import (
+    build_full, build_incremental, clear_state, load_state, save_state
+)
+from engine.io import memory_report, read_daily, use_profile
+from engine.metrics import add_profile_arg, start_profile
+from engine.parallel import run_sharded
+from engine.prefetch import add_prefetch_arg, prefetch, use_prefetch
 
 # ================= LOGIC =================
+# OHLC + Volume per trading-calendar bucket (engine.aggregate)
 def build_weekly(df):
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date")
-
-    # Monday=0 ... Wednesday=2
-    df["weekday"] = df["date"].dt.weekday
-
-    # New week starts on Wednesday
-    df["week_id"] = (df["weekday"] == 2).cumsum()
-
-    weekly = (
-        df.groupby("week_id")
-        .agg(
-            Week_Start=("date", "min"),
-            Week_End=("date", "max"),
-            Open=("open", "first"),
-            High=("high", "max"),
-            Low=("low", "min"),
-            Close=("close", "last"),
-        )
-        .reset_index(drop=True)
-    )
-
-    return weekly
+    return candles(df, TIMEFRAMES["weekly"])
 
 # ================= MAIN =================
-def main():
-    files = sorted(MASTER_DIR.glob("*.csv"))
-    print(f"Processing {len(files)} symbols...\n")
+def build_files(files, incremental):
+    state = load_state(OUT_DIR) if incremental else {}
+    log, entries = [], {}
+
+    # Incremental symbols read their own tail; the rest are read ahead
+    def read(file):
+        return None if file.stem in state else read_daily(file)
 
-    for file in files:
-        df = pd.read_csv(file)
+    for file, load in prefetch(files, read):
+        symbol = file.stem
+        out_file = OUT_DIR / f"{symbol}.csv"
 
-        required = {"date", "open", "high", "low", "close"}
-        if not required.issubset(df.columns):
-            print(f"❌ Skipping {file.name}")
+        try:
+            if symbol in state:
+                entry, status = build_incremental(
+                    file, out_file, build_weekly, "Week_Start", state[symbol]
+                )
+                entries[symbol] = entry
+                log.append(f"✓ Weekly ({status}): {file.name}")
+                continue
+
+            df = load()
+            required = {"date", "open", "high", "low", "close"}
+            if not required.issubset(df.columns) or df.empty:
+                log.append(f"❌ Skipping {file.name}")
+                continue
+
+            entry = build_full(file, out_file, build_weekly, "Week_Start", df, incremental)
+        except Exception as e:
+            log.append(f"⚠️ Skipped {file.name}: {e}")
             continue
 
-        weekly = build_weekly(df)
-        out_file = OUT_DIR / file.name
-        weekly.to_csv(out_file, index=False)
+        if incremental:
+            entries[symbol] = entry
+        log.append(f"✓ Weekly: {file.name}")
+
+    return log, entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build weekly candles")
+    parser.add_argument(
+        "--store", action="store_true", help="read the columnar store instead of CSV"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="processes building symbols"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="update only the open weekly candle since the last run",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="float32 / int32 / categorical load profile (engine.io)",
+    )
+    add_prefetch_arg(parser)
+    add_profile_arg(parser)
+    args = parser.parse_args(argv)
+    start_profile(args.profile)
+
+    if args.compact:
+        use_profile("compact")
+    if args.prefetch is not None:
+        use_prefetch(args.prefetch)
+
+    if args.store:
+        files = sorted(STORE_MASTER_DIR.glob("*.parquet"))
+    else:
+        files = sorted(MASTER_DIR.glob("*.csv"))
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    print(f"Processing {len(files)} symbols...\n")
+
+    state = {}
+    for log, entries in run_sharded(build_files, files, args.workers, args.incremental):
+        for line in log:
+            print(line)
+        state.update(entries)
+
+    # State (+ daily file fingerprints) only for --incremental runs
+    if args.incremental:
+        save_state(OUT_DIR, state)
+    else:
+        clear_state(OUT_DIR)
 
-        print(f"✓ Weekly: {file.name}")
+    report = memory_report()
+    if report:
+        print(report)
 
     print("\n✅ WEEKLY WED→TUE CANDLES CREATED")
 
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | All Patterns Scanner (EOD)
+
+✔ Reads each master / master_future file once
+✔ Runs every registered pattern on the loaded frame
+✔ Writes the same per-pattern report CSVs
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine.scan import main
+
+if __name__ == "__main__":
+    main()
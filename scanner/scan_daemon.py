@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine
+Resident scan service (HTTP on localhost)
+
+✔ master / master_future loaded once, changed files reloaded per request
+✔ curl "http://127.0.0.1:8765/scan?pattern=gravestone_doji"
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine.daemon import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Pattern History Scanner
+
+✔ Every pattern at every date of every symbol
+✔ One event table: SYMBOL, DATE, PATTERN, TYPE, metrics
+✔ --symbols / --since / --patterns to narrow it down
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine.history import main
+
+if __name__ == "__main__":
+    main()
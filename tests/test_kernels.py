@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ExpiryEngine | Kernel masks vs the baseline per-row checks
+
+✔ Synthetic OHLCV frames: engulfing, doji / gravestone, stars, green
+   streaks with flat / rising / peak volumes, ties on every threshold,
+   zero-range bars, NaN prices / volumes, 0-3 bar histories
+✔ Every bar of every frame: kernel mask (engine.kernels.build_panel, as
+   the scanner runs it) == scalar check of the scanner/ scripts on the
+   bars up to it
+✔ NaN anywhere in a check's bars → no match (the scripts' max() of a
+   NaN volume list depends on where the NaN sits)
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.kernels import build_panel
+from engine.patterns import (
+    BODY_PCT_MAX, LOWER_WICK_MAX, SMALL_BODY_MAX, STRONG_BODY_MIN,
+    UPPER_WICK_MIN, patterns_for,
+)
+
+COLUMNS = ["OPEN", "HIGH", "LOW", "CLOSE", "TOTTRDQTY"]
+NAN = float("nan")
+
+# ==================================================
+# FRAMES
+# ==================================================
+def frame(bars):
+    # [(open, high, low, close, volume)] → daily master frame
+    df = pd.DataFrame(bars, columns=COLUMNS, dtype=np.float64)
+    df.insert(0, "DATE", pd.date_range("2026-01-01", periods=len(df), freq="D"))
+    return df
+
+
+def random_bars(seed, n=300):
+    # Prices on a 0.05 grid, volumes in a narrow band → plenty of ties
+    rng = np.random.default_rng(seed)
+    bars, close = [], 100.0
+    for _ in range(n):
+        o = round(close + rng.integers(-4, 5) * 0.05, 2)
+        c = round(o + rng.integers(-6, 7) * 0.05, 2)
+        h = round(max(o, c) + rng.integers(0, 6) * 0.05, 2)
+        l = round(min(o, c) - rng.integers(0, 6) * 0.05, 2)
+        bars.append((o, h, l, c, float(rng.integers(1, 6) * 100)))
+        close = c
+    return bars
+
+
+ENGULFING = [
+    (10, 10.5, 8.5, 9, 100), (8.8, 11.2, 8.7, 11, 120),     # bullish
+    (11, 12.5, 10.8, 12, 90), (12.2, 12.3, 10.5, 10.8, 80),  # bearish
+    (10.8, 11, 10, 10, 70), (10, 11, 9.9, 10.8, 60),          # equal bodies
+    (10.8, 11, 10, 10, 70), (10.1, 10.9, 9.9, 10.7, 60),      # inside body
+    (10, 10, 10, 10, 50), (9, 11, 9, 11, 50),                 # flat → green
+]
+
+DOJI = [
+    (10, 12, 10, 10, 100),        # pure gravestone
+    (10, 10, 10, 10, 100),        # zero range
+    (8, 16, 6, 10, 100),          # body 20%, lower 20%, upper 60%: all on the line
+    (10, 15, 5, 10, 100),         # wicks 50 / 50: no
+    (11, 13, 10, 10.4, 100),      # red, body 20%
+    (10, 11, 9, 10, 100),         # plain doji, wicks both sides
+    (10.2, 15, 10, 10, 100),      # upper 80%, lower 0
+]
+
+STARS = [
+    (20, 20.5, 15.5, 16, 100), (15.8, 16.3, 15.3, 15.9, 90), (16, 19.5, 15.9, 19, 110),
+    (16, 20.5, 15.5, 20, 100), (20.2, 20.6, 19.8, 20.1, 90), (20, 20.1, 16.8, 17, 110),
+    (20, 20.5, 15.5, 16, 100), (15.8, 16.3, 15.3, 15.9, 90), (15.9, 18.5, 15.8, 18, 110),  # close == midpoint
+    (18, 22, 18, 22, 100), (22, 22.5, 21.5, 22.1, 90), (22.1, 22.2, 19.9, 20, 110),
+    (20, 20, 16, 16, 100), (16, 16, 16, 16, 90), (16, 19, 16, 19, 110),  # flat middle
+]
+
+STREAKS = [
+    (10, 11, 9.5, 10.5, 100), (10.5, 11.5, 10, 11, 200), (11, 12, 10.5, 11.5, 300),
+    (11.5, 12.5, 11, 12, 400), (12, 13, 11.5, 12.5, 400), (12.5, 13.5, 12, 13, 300),
+    (13, 14, 12.5, 13.5, 500), (13.5, 14, 13, 13.5, 600), (13.5, 14.5, 13, 14, 100),
+    (14, 15, 13.5, 14.5, 200), (14.5, 15.5, 14, 15, 250), (15, 16, 14.5, 15.5, 300),
+    (15.5, 16.5, 15, 16, 400), (16, 17, 15.5, 16.5, 500), (16.5, 17, 16, 16.9, 600),
+]
+
+NAN_BARS = [
+    (10, 10.5, 8.5, 9, 100), (8.8, 11.2, 8.7, NAN, 120), (10, 12, 10, 10, 100),
+    (NAN, 12, 10, 10, 100), (10, 12, NAN, 10, 100), (10, 11, 9.5, 10.5, 100),
+    (10.5, 11.5, 10, 11, NAN), (11, 12, 10.5, 11.5, 300), (11.5, 12.5, 11, 12, 400),
+    (12, 13, 11.5, 12.5, 500), (NAN, NAN, NAN, NAN, NAN), (12.5, 13.5, 12, 13, 600),
+    (13, 14, 12.5, 13.5, 700), (13.5, 14.5, 13, 14, 800), (14, 15, 13.5, 14.5, 900),
+]
+
+FRAMES = {
+    "engulfing": ENGULFING,
+    "doji": DOJI,
+    "stars": STARS,
+    "streaks": STREAKS,
+    "nan": NAN_BARS,
+    "random": random_bars(3),
+    "random_wide": random_bars(11, 500),
+    "one_bar": STREAKS[:1],
+    "two_bars": ENGULFING[:2],
+    "three_bars": STARS[:3],
+}
+
+# ==================================================
+# BASELINE CHECKS (scanner/ scripts, on the bars up to one bar)
+# ==================================================
+def present(*values):
+    return not any(math.isnan(v) for v in values)
+
+
+def engulfing(df):
+    if len(df) < 2:
+        return set()
+    prev, curr = df.iloc[-2], df.iloc[-1]
+    po, pc, co, cc = prev["OPEN"], prev["CLOSE"], curr["OPEN"], curr["CLOSE"]
+    if not present(po, pc, co, cc):
+        return set()
+
+    covers = min(co, cc) <= min(po, pc) and max(co, cc) >= max(po, pc)
+    kinds = set()
+    if pc < po and cc > co and covers:
+        kinds.add("BULLISH")
+    if pc > po and cc < co and covers:
+        kinds.add("BEARISH")
+    return kinds
+
+
+def gravestone(df):
+    if len(df) < 1:
+        return set()
+    last = df.iloc[-1]
+    o, h, l, c = last["OPEN"], last["HIGH"], last["LOW"], last["CLOSE"]
+    rng = h - l
+    if not present(o, h, l, c) or rng <= 0:
+        return set()
+
+    body = abs(o - c)
+    upper_wick = h - max(o, c)
+    lower_wick = min(o, c) - l
+    if (
+        body <= BODY_PCT_MAX * rng and
+        lower_wick <= LOWER_WICK_MAX * rng and
+        upper_wick >= UPPER_WICK_MIN * rng
+    ):
+        return {None}
+    return set()
+
+
+def star(df):
+    if len(df) < 3:
+        return set()
+    c1, c2, c3 = df.iloc[-3], df.iloc[-2], df.iloc[-1]
+    if not present(*(c[k] for c in (c1, c2, c3) for k in COLUMNS[:4])):
+        return set()
+
+    (r1, b1), (r2, b2), (r3, b3) = (
+        (c["HIGH"] - c["LOW"], abs(c["OPEN"] - c["CLOSE"])) for c in (c1, c2, c3)
+    )
+    if min(r1, r2, r3) <= 0:
+        return set()
+
+    strong = b1 >= STRONG_BODY_MIN * r1 and b2 <= SMALL_BODY_MAX * r2 and b3 >= STRONG_BODY_MIN * r3
+    mid = (c1["OPEN"] + c1["CLOSE"]) / 2
+    kinds = set()
+    if strong and c1["CLOSE"] < c1["OPEN"] and c3["CLOSE"] > c3["OPEN"] and c3["CLOSE"] >= mid:
+        kinds.add("MORNING_STAR")
+    if strong and c1["CLOSE"] > c1["OPEN"] and c3["CLOSE"] < c3["OPEN"] and c3["CLOSE"] <= mid:
+        kinds.add("EVENING_STAR")
+    return kinds
+
+
+def green(df, n):
+    if len(df) < n:
+        return False
+    last = df.tail(n)
+    return all(row["CLOSE"] > row["OPEN"] for _, row in last.iterrows())
+
+
+def volume_confirm(df, n):
+    if not green(df, n):
+        return set()
+    vols = df["TOTTRDQTY"].tail(n).tolist()
+    return {None} if present(*vols) and vols[-1] == max(vols) else set()
+
+
+def volume_increasing(df, n):
+    if not green(df, n):
+        return set()
+    vols = df["TOTTRDQTY"].tail(n).tolist()
+    rising = all(a < b for a, b in zip(vols, vols[1:]))
+    return {None} if present(*vols) and rising else set()
+
+
+CHECKS = {
+    "engulfing": engulfing,
+    "gravestone_doji": gravestone,
+    "morning_evening_star": star,
+}
+for n in (1, 2, 4, 7):
+    CHECKS[f"green_{n}"] = lambda df, n=n: {None} if green(df, n) else set()
+    CHECKS[f"green_{n}_volume_confirm"] = lambda df, n=n: volume_confirm(df, n)
+    CHECKS[f"green_{n}_volume_increasing"] = lambda df, n=n: volume_increasing(df, n)
+
+# ==================================================
+# TESTS
+# ==================================================
+def kernel_kinds(pattern, df):
+    # Kinds matching at each bar: kernel over the whole history right-aligned
+    panel = build_panel([df], pattern.panel_columns, len(df), pattern.columns)
+    masks = pattern.kernel(panel)
+    return [
+        {kind for kind, mask in masks.items() if mask[0, i]}
+        for i in range(len(df))
+    ]
+
+
+@pytest.mark.parametrize("frame_name", sorted(FRAMES))
+@pytest.mark.parametrize("name", sorted(CHECKS))
+def test_kernel_matches_baseline(name, frame_name):
+    pattern = patterns_for([name])[0]
+    check = CHECKS[name]
+    df = frame(FRAMES[frame_name])
+
+    got = kernel_kinds(pattern, df)
+    want = [check(df.iloc[:i + 1]) for i in range(len(df))]
+    assert got == want
+
+
+def test_frames_hit_every_kind():
+    # The synthetic frames exercise each kind at least once
+    hits = {}
+    for name in CHECKS:
+        pattern = patterns_for([name])[0]
+        for bars in FRAMES.values():
+            for kinds in kernel_kinds(pattern, frame(bars)):
+                hits.setdefault(name, set()).update(kinds)
+
+    assert hits["engulfing"] == {"BULLISH", "BEARISH"}
+    assert hits["morning_evening_star"] == {"MORNING_STAR", "EVENING_STAR"}
+    for name in CHECKS:
+        if name not in ("engulfing", "morning_evening_star"):
+            assert hits[name] == {None}, name
+
+
+def test_empty_history():
+    for name in CHECKS:
+        pattern = patterns_for([name])[0]
+        assert kernel_kinds(pattern, frame([])) == []